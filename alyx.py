@@ -1,7 +1,6 @@
 # --- Core Imports ---
 import asyncio
 import base64
-import io
 import os
 import sys
 import traceback
@@ -9,31 +8,66 @@ import json
 import websockets
 import argparse
 import threading
+import time
+import concurrent.futures
 from html import escape
+from urllib.parse import quote, quote_plus
 import subprocess
+import shutil
 import webbrowser
 import math
+import functools
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from types import MappingProxyType
 
 # --- PySide6 GUI Imports ---
 from PySide6.QtWidgets import (QApplication, QMainWindow, QTextEdit, QTextBrowser, QLabel,
                                QVBoxLayout, QWidget, QLineEdit, QHBoxLayout,
-                               QSizePolicy, QPushButton)
-from PySide6.QtCore import QObject, Signal, Slot, Qt, QTimer
+                               QSizePolicy, QPushButton, QStyle, QFrame)
+from PySide6.QtCore import QObject, Signal, Slot, Qt, QTimer, QRectF
 from PySide6.QtGui import (QImage, QPixmap, QFont, QFontDatabase, QTextCursor, 
-                           QPainter, QPen, QVector3D, QMatrix4x4, QColor, QBrush)
+                           QPainter, QPen, QColor, QMatrix4x4, QVector2D, QOpenGLContext, QSurfaceFormat)
+from PySide6.QtOpenGL import (QOpenGLShader, QOpenGLShaderProgram, QOpenGLBuffer,
+                              QOpenGLVertexArrayObject, QOpenGLWindow, QOpenGLTexture,
+                              QOpenGLPixelTransferOptions)
 from PySide6.QtOpenGLWidgets import QOpenGLWidget
+from shiboken6 import VoidPtr
 
 
 # --- Media and AI Imports ---
 import cv2
 import pyaudio
-import PIL.Image
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
-from PIL import ImageGrab
+import mss
 import numpy as np
 
+# --- Optional Speedups ---
+try:
+    import uvloop  # Faster event loop for the websocket/audio backend (no Windows support)
+except ImportError:
+    uvloop = None
+try:
+    import orjson  # C JSON codec for the TTS websocket messages
+except ImportError:
+    orjson = None
+try:
+    from numba import njit  # JIT for the CPU sphere projection kernel
+except ImportError:
+    njit = None
+try:
+    import psutil  # Kills processes in-process instead of spawning taskkill
+except ImportError:
+    psutil = None
+
+if orjson:
+    def json_dumps(obj): return orjson.dumps(obj).decode()
+    json_loads = orjson.loads
+else:
+    json_dumps, json_loads = json.dumps, json.loads
+
 
 # --- Load Environment Variables ---
 load_dotenv()
@@ -51,109 +85,790 @@ CHANNELS = 1
 SEND_SAMPLE_RATE = 16000
 RECEIVE_SAMPLE_RATE = 24000
 CHUNK_SIZE = 1024
+MIC_RING_CHUNKS = 32  # Mic ring buffer capacity in chunks (~2 s at 16 kHz)
+REALTIME_AUDIO_BATCH_BYTES = 16384  # Max queued mic PCM coalesced into one realtime send
+GEMINI_QUEUE_SIZE = 50  # Pending uplink messages (~3 s of mic audio) before new ones are dropped
+PLAYBACK_QUEUE_MAX = 400  # Buffered reply chunks before the oldest are dropped (only hit if playback stalls)
+PLAYBACK_FRAMES = 1200  # Speaker callback period in frames (50 ms at 24 kHz)
 MODEL = "gemini-2.5-flash-native-audio-latest"
 VOICE_TYPE= 'Kore' # Voice Options: Aoede, Charon, Fenrir, Kore, Puck, Leda, Orus, Zephyr
 DEFAULT_MODE = "camera"  # Mode Options: "camera", "screen", "none"
+RENDER_BACKEND = "opengl"  # Render Options: "opengl", "cpu"
+VIDEO_RENDER_BACKEND = "cpu"  # Preview Options: "cpu", "opengl" (native GL child window, opt-in until checked per platform)
+CAMERA_WIDTH, CAMERA_HEIGHT = 640, 480  # Requested webcam resolution (MJPEG)
+PREVIEW_FPS = 30  # Target rate for the webcam preview
+GEMINI_FRAME_MAX_SIDE = 1024  # Frames sent to Gemini are shrunk to fit this box
+GEMINI_JPEG_PARAMS = (cv2.IMWRITE_JPEG_QUALITY, 80, cv2.IMWRITE_JPEG_OPTIMIZE, 0)  # Quality 80, no Huffman optimization pass
+MAX_READ_BYTES = 1024 * 1024  # read_file returns at most this much of a file
+FILE_IO_BUFFER = 1 << 20  # Buffer size for the file tools' reads and writes
+TEXT_FLUSH_DELAY = 0.016  # Seconds of streamed text coalesced into one text_received emit
+GUI_TEXT_FLUSH_MS = 40  # Transcript inserts arriving within this window are drawn as one
+ACTIVITY_LOG_MAX_BLOCKS = 2000  # Oldest system log blocks are dropped past this many
+TRANSCRIPT_MAX_BLOCKS = 2000  # Same rolling cap for the conversation transcript
+SEARCH_CACHE_SIZE = 128  # File search results kept in the LRU
+SEARCH_CACHE_TTL = 60  # Seconds a cached file search stays valid
 MAX_OUTPUT_TOKENS = 100
 
+# --- User Folders (resolved once; the environment doesn't change while running) ---
+HOME = os.path.expanduser("~")
+USER_DIRS = MappingProxyType({name.lower(): os.path.join(HOME, name)
+                              for name in ("Desktop", "Downloads", "Documents", "Videos", "Music", "Pictures")})
+LOCAL_APPDATA = os.environ.get("LocalAppData", "")
+_APPDATA = os.environ.get("AppData", "")
+# Install locations searched for .exe files that aren't on PATH
+WIN_SEARCH_DIRS = tuple(d for d in (
+    os.environ.get("ProgramFiles", "C:\\Program Files"),
+    os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"),
+    LOCAL_APPDATA,
+    LOCAL_APPDATA and os.path.join(LOCAL_APPDATA, "Programs"),
+    _APPDATA and os.path.join(_APPDATA, "..\\Local\\Programs"),
+    _APPDATA and os.path.join(_APPDATA, "Local\\Programs"),
+) if d and os.path.isdir(d))
+
 # --- Initialize Clients ---
 pya = pyaudio.PyAudio()
 
 # ==============================================================================
 # AI Animation Widget
 # ==============================================================================
+# 256-entry sine table for the speaking pulse, indexed by the quantized pulse angle
+PULSE_SIN_LUT = np.sin(np.linspace(0, 2 * np.pi, 256, endpoint=False)).astype(np.float32)
+PULSE_LUT_SCALE = 256 / (2 * math.pi)
+
+
+def rotation_matrix(angle_x, angle_y):
+    """Returns the 3x3 rotation (in degrees) applied to the sphere: Ry @ Rx."""
+    # The angles advance in 0.1 degree multiples, so quantizing makes nearly every frame a cache hit
+    return _cached_rotation_matrix(round(angle_x, 1), round(angle_y, 1))
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_rotation_matrix(angle_x, angle_y):
+    ay, ax = math.radians(angle_y), math.radians(angle_x)
+    cy, sy, cx, sx = math.cos(ay), math.sin(ay), math.cos(ax), math.sin(ax)
+    rotation_y = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]], dtype=np.float32)
+    rotation_x = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]], dtype=np.float32)
+    rotation = rotation_y @ rotation_x
+    rotation.setflags(write=False) # Shared between frames, so callers must not mutate it
+    return rotation
+
+
+def _project_sphere_numpy(points, rotation, pulse, buckets):
+    """Projects the sphere to int32 (x, y, sprite bucket) arrays, ordered far side first."""
+    rotated = points @ rotation.T
+    z = rotated[:, 2]
+    z_factor = 200 / (200 + z)
+    xs = (rotated[:, 0] * z_factor * pulse).astype(np.int32)
+    ys = (rotated[:, 1] * z_factor * pulse).astype(np.int32)
+    size = (z + 60) / 120
+    bucket = np.clip((size * buckets).astype(np.int32), 0, buckets - 1)
+    # Buckets grow with point size, so drawing in size order keeps the near side on top
+    order = np.argsort(size, kind='mergesort')
+    return xs[order], ys[order], bucket[order]
+
+
+def _project_sphere_loop(points, rotation, pulse, buckets):
+    """Same as _project_sphere_numpy as one fused loop, for numba to compile."""
+    n = points.shape[0]
+    xs, ys = np.empty(n, np.int32), np.empty(n, np.int32)
+    size, bucket = np.empty(n, np.float32), np.empty(n, np.int32)
+    for i in range(n):
+        px, py, pz = points[i, 0], points[i, 1], points[i, 2]
+        z = rotation[2, 0] * px + rotation[2, 1] * py + rotation[2, 2] * pz
+        scale = 200 / (200 + z) * pulse
+        xs[i] = int((rotation[0, 0] * px + rotation[0, 1] * py + rotation[0, 2] * pz) * scale)
+        ys[i] = int((rotation[1, 0] * px + rotation[1, 1] * py + rotation[1, 2] * pz) * scale)
+        size[i] = (z + 60) / 120
+        bucket[i] = min(max(int(size[i] * buckets), 0), buckets - 1)
+    order = np.argsort(size, kind='mergesort')
+    return xs[order], ys[order], bucket[order]
+
+
+project_sphere = njit(cache=True, fastmath=True)(_project_sphere_loop) if njit else _project_sphere_numpy
+
+
 class AIAnimationWidget(QWidget):
+    SPRITE_BUCKETS = 8 # Distinct size/alpha steps for the pre-rendered point sprites
+    SPEAKING_INTERVAL_MS = 30 # Update about 33 times per second while the pulse runs
+    IDLE_INTERVAL_MS = 60 # The slow idle spin looks the same at half the frame rate
+    IDLE_COLOR = QColor(0, 255, 255)
+    SPEAKING_COLOR = QColor(170, 255, 255)
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.init_animation()
+        self._sprites_cyan = self._sprites_hot = None
+        self._sprite_dpr = None
+        self._backing = None
+        self._dirty_rect = None # Area of the backing touched by the previous frame
+        # The parent panel shows through the backing image, so Qt needn't erase the widget first
+        self.setAttribute(Qt.WA_NoSystemBackground)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+    def init_animation(self):
+        """Sets up the rotation/pulse state and the tick timer shared by both render backends."""
         self.angle_y = 0
         self.angle_x = 0
-        self.sphere_points = self.create_sphere_points()
+        self.sphere_points_np = self.create_sphere_points()
         self.is_speaking = False
         self.pulse_angle = 0
 
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_animation)
-        self.timer.start(30) # Update about 33 times per second
+        self.timer.start(self.IDLE_INTERVAL_MS)
+
+    def pulse_factor(self):
+        """Returns the current scale of the speaking pulse (1.0 when idle)."""
+        if not self.is_speaking:
+            return 1.0
+        pulse_amplitude = 0.08 # Pulse by 8%
+        pulse = 0.5 * (1 + PULSE_SIN_LUT[int(self.pulse_angle * PULSE_LUT_SCALE) & 255])
+        return 1.0 + float(pulse) * pulse_amplitude
 
     def start_speaking_animation(self):
         """Activates the speaking animation state."""
         self.is_speaking = True
+        self.timer.setInterval(self.SPEAKING_INTERVAL_MS)
 
     def stop_speaking_animation(self):
         """Deactivates the speaking animation state."""
         self.is_speaking = False
         self.pulse_angle = 0 # Reset for a clean start next time
+        self.timer.setInterval(self.IDLE_INTERVAL_MS)
         self.update() # Schedule a final repaint in the non-speaking state
 
+    def showEvent(self, event):
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop() # No background ticking while the widget can't be seen
+        super().hideEvent(event)
+
     def create_sphere_points(self, radius=60, num_points_lat=20, num_points_lon=40):
-        """Creates a list of QVector3D points on the surface of a sphere."""
-        points = []
-        for i in range(num_points_lat + 1):
-            lat = math.pi * (-0.5 + i / num_points_lat)
-            y = radius * math.sin(lat)
-            xy_radius = radius * math.cos(lat)
-
-            for j in range(num_points_lon):
-                lon = 2 * math.pi * (j / num_points_lon)
-                x = xy_radius * math.cos(lon)
-                z = xy_radius * math.sin(lon)
-                points.append(QVector3D(x, y, z))
-        return points
+        """Returns an (N, 3) float32 array of points on the surface of a sphere."""
+        lat = np.pi * (-0.5 + np.arange(num_points_lat + 1) / num_points_lat)
+        lon = 2 * np.pi * np.arange(num_points_lon) / num_points_lon
+        xy_radius = radius * np.cos(lat)
+        x = np.outer(xy_radius, np.cos(lon))
+        y = np.repeat((radius * np.sin(lat))[:, None], num_points_lon, axis=1)
+        z = np.outer(xy_radius, np.sin(lon))
+        return np.column_stack([x.ravel(), y.ravel(), z.ravel()]).astype(np.float32)
+
+    def build_sprites(self, color, dpr):
+        """Pre-renders one antialiased dot per size bucket, with the bucket's alpha baked in."""
+        sprites = []
+        for i in range(self.SPRITE_BUCKETS):
+            size = (i + 0.5) / self.SPRITE_BUCKETS
+            diameter = int(1 + size * 3)
+            sprite = QPixmap(math.ceil(diameter * dpr), math.ceil(diameter * dpr))
+            sprite.setDevicePixelRatio(dpr)
+            sprite.fill(Qt.transparent)
+            painter = QPainter(sprite)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            fill = QColor(color)
+            fill.setAlpha(int(50 + 205 * size))
+            painter.setBrush(fill)
+            painter.drawEllipse(QRectF(0, 0, diameter, diameter))
+            painter.end()
+            sprites.append(sprite)
+        return sprites
 
     def update_animation(self):
-        self.angle_y += 0.8
-        self.angle_x += 0.2
+        # Scale the per-tick step by the interval so the spin speed doesn't depend on it
+        step = self.timer.interval() / self.SPEAKING_INTERVAL_MS
+        # Keep the angles on the 0.1 degree grid so rotation_matrix's cache keeps cycling
+        self.angle_y = round(self.angle_y + 0.8 * step, 1)
+        self.angle_x = round(self.angle_x + 0.2 * step, 1)
         if self.is_speaking:
-            self.pulse_angle += 0.2
+            self.pulse_angle += 0.2 * step
             if self.pulse_angle > math.pi * 2:
                 self.pulse_angle -= math.pi * 2
 
         if self.angle_y >= 360: self.angle_y = 0
         if self.angle_x >= 360: self.angle_x = 0
-        self.update()
+        if self.isVisible() and not self.visibleRegion().isEmpty():
+            self.update()
+
+    def allocate_backing(self):
+        """(Re)creates the premultiplied ARGB32 image the points are drawn into."""
+        dpr = self.devicePixelRatioF()
+        self._backing = QImage(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)),
+                               QImage.Format_ARGB32_Premultiplied)
+        self._backing.setDevicePixelRatio(dpr)
+        self._backing.fill(Qt.transparent)
+        self._dirty_rect = None
+
+    def resizeEvent(self, event):
+        self.allocate_backing()
+        super().resizeEvent(event)
 
     def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.fillRect(self.rect(), Qt.transparent)
+        dpr = self.devicePixelRatioF()
+        if dpr != self._sprite_dpr:
+            self._sprites_cyan = self.build_sprites(self.IDLE_COLOR, dpr)
+            self._sprites_hot = self.build_sprites(self.SPEAKING_COLOR, dpr)
+            self._sprite_dpr = dpr
+        if self._backing is None or self._backing.devicePixelRatio() != dpr:
+            self.allocate_backing()
+
+        # Sprites are already antialiased, so no render hints are needed for the blits
+        painter = QPainter(self._backing)
 
         w, h = self.width(), self.height()
         painter.translate(w / 2, h / 2)
+        if self._dirty_rect is not None: # Only wipe what the last frame drew, not the whole image
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.fillRect(self._dirty_rect, Qt.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+
+        rotation = rotation_matrix(self.angle_x, self.angle_y)
+        xs, ys, buckets = project_sphere(self.sphere_points_np, rotation, self.pulse_factor(), self.SPRITE_BUCKETS)
+        self._dirty_rect = QRectF(int(xs.min()), int(ys.min()), int(xs.max() - xs.min()) + 5, int(ys.max() - ys.min()) + 5)
+        xs, ys, buckets = xs.tolist(), ys.tolist(), buckets.tolist()
+
+        sprites = self._sprites_hot if self.is_speaking else self._sprites_cyan
+        for x, y, bucket in zip(xs, ys, buckets):
+            painter.drawPixmap(x, y, sprites[bucket])
+        painter.end()
+
+        QPainter(self).drawImage(0, 0, self._backing)
+
+# Raw GL enums — PySide6 exposes QOpenGLFunctions but not the constants
+GL_POINTS = 0x0000
+GL_ONE = 0x0001
+GL_TRIANGLE_STRIP = 0x0005
+GL_SRC_ALPHA = 0x0302
+GL_ONE_MINUS_SRC_ALPHA = 0x0303
+GL_BLEND = 0x0BE2
+GL_FLOAT = 0x1406
+GL_COLOR_BUFFER_BIT = 0x4000
+GL_PROGRAM_POINT_SIZE = 0x8642
+GL_POINT_SPRITE = 0x8861
+
+
+class AIAnimationGLWidget(QOpenGLWidget):
+    """
+    GPU variant of AIAnimationWidget. The sphere is uploaded once into a VBO
+    and drawn with a single glDrawArrays(GL_POINTS) call; the vertex shader
+    does the rotation, perspective and point sizing the CPU path does in NumPy.
+    """
+    gl_unavailable = Signal() # The context or shader failed; MainWindow swaps in AIAnimationWidget
+    SPEAKING_INTERVAL_MS = AIAnimationWidget.SPEAKING_INTERVAL_MS
+    IDLE_INTERVAL_MS = AIAnimationWidget.IDLE_INTERVAL_MS
+    IDLE_COLOR = AIAnimationWidget.IDLE_COLOR
+    SPEAKING_COLOR = AIAnimationWidget.SPEAKING_COLOR
+
+    VERTEX_SHADER = """
+        attribute highp vec3 a_position;
+        uniform highp mat4 u_rotation;
+        uniform highp vec2 u_half_size;
+        uniform mediump float u_pulse;
+        uniform mediump float u_dpr;
+        varying mediump float v_alpha;
+        void main() {
+            highp vec4 rotated = u_rotation * vec4(a_position, 1.0);
+            highp float size = (rotated.z + 60.0) / 120.0;
+            highp float point_size = 1.0 + size * 3.0;
+            highp vec2 pos = rotated.xy * (200.0 / (200.0 + rotated.z)) * u_pulse + point_size * 0.5;
+            gl_Position = vec4(pos.x / u_half_size.x, -pos.y / u_half_size.y, 0.0, 1.0);
+            gl_PointSize = point_size * u_dpr;
+            v_alpha = (50.0 + 205.0 * size) / 255.0;
+        }
+    """
 
-        pulse_factor = 1.0
-        if self.is_speaking:
-            pulse_amplitude = 0.08 # Pulse by 8%
-            pulse = (1 + math.sin(self.pulse_angle)) / 2
-            pulse_factor = 1.0 + (pulse * pulse_amplitude)
+    FRAGMENT_SHADER = """
+        uniform mediump vec4 u_color;
+        varying mediump float v_alpha;
+        void main() {
+            mediump float d = length(gl_PointCoord - vec2(0.5));
+            if (d > 0.5) discard;
+            gl_FragColor = vec4(u_color.rgb, v_alpha * (1.0 - smoothstep(0.35, 0.5, d)));
+        }
+    """
 
-        rotation_y = QMatrix4x4(); rotation_y.rotate(self.angle_y, 0, 1, 0)
-        rotation_x = QMatrix4x4(); rotation_x.rotate(self.angle_x, 1, 0, 0)
-        rotation = rotation_y * rotation_x
+    # Share the rotation/pulse state machine with the CPU widget
+    init_animation = AIAnimationWidget.init_animation
+    pulse_factor = AIAnimationWidget.pulse_factor
+    create_sphere_points = AIAnimationWidget.create_sphere_points
+    start_speaking_animation = AIAnimationWidget.start_speaking_animation
+    stop_speaking_animation = AIAnimationWidget.stop_speaking_animation
+    update_animation = AIAnimationWidget.update_animation
 
-        projected_points = []
-        for point in self.sphere_points:
-            rotated_point = rotation.map(point)
-            
-            z_factor = 200 / (200 + rotated_point.z())
-            x = (rotated_point.x() * z_factor) * pulse_factor
-            y = (rotated_point.y() * z_factor) * pulse_factor
-            
-            size = (rotated_point.z() + 60) / 120
-            alpha = int(50 + 205 * size)
-            point_size = 1 + size * 3
-            projected_points.append((x, y, point_size, alpha))
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_animation()
+        self._program = None
+        self._vbo = None
+        self._vao = None
+        # Cleared to transparent so the panel behind shows through, like the CPU widget's backing image
+        self.setAttribute(Qt.WA_AlwaysStackOnTop)
+
+    def showEvent(self, event):
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def initializeGL(self):
+        ctx = self.context()
+        if ctx is None or not ctx.isValid():
+            self.gl_unavailable.emit(); return
+        version = "#version 100\n" if ctx.isOpenGLES() else "#version 120\n"
+        self._program = QOpenGLShaderProgram(self)
+        self._program.addShaderFromSourceCode(QOpenGLShader.Vertex, version + self.VERTEX_SHADER)
+        self._program.addShaderFromSourceCode(QOpenGLShader.Fragment, version + self.FRAGMENT_SHADER)
+        self._program.bindAttributeLocation("a_position", 0)
+        if not self._program.link():
+            print(f">>> [ERROR] Animation shader failed to link, using the CPU renderer: {self._program.log()}")
+            self._program = None
+            self.gl_unavailable.emit(); return
+        self._u_rotation = self._program.uniformLocation("u_rotation")
+        self._u_half_size = self._program.uniformLocation("u_half_size")
+        self._u_pulse = self._program.uniformLocation("u_pulse")
+        self._u_dpr = self._program.uniformLocation("u_dpr")
+        self._u_color = self._program.uniformLocation("u_color")
+
+        self._vao = QOpenGLVertexArrayObject(self)
+        self._vao.create() # Only needed (and only succeeds) on core profiles
+        if self._vao.isCreated(): self._vao.bind()
+        data = self.sphere_points_np.tobytes()
+        self._vbo = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+        self._vbo.create()
+        self._vbo.bind()
+        self._vbo.allocate(data, len(data))
+        self._program.enableAttributeArray(0)
+        self._program.setAttributeBuffer(0, GL_FLOAT, 0, 3, 0)
+        self._vbo.release()
+        if self._vao.isCreated(): self._vao.release()
+
+        f = ctx.functions()
+        f.glEnable(GL_BLEND)
+        f.glBlendFuncSeparate(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+        if not ctx.isOpenGLES():
+            f.glEnable(GL_PROGRAM_POINT_SIZE)
+            # Needed for gl_PointCoord on compatibility profiles; an invalid enum on core ones
+            if ctx.format().profile() != QSurfaceFormat.CoreProfile: f.glEnable(GL_POINT_SPRITE)
+        f.glClearColor(0.0, 0.0, 0.0, 0.0)
+
+    def paintGL(self):
+        if self._program is None: return # GL setup failed; the CPU widget is taking over
+        f = self.context().functions()
+        f.glClear(GL_COLOR_BUFFER_BIT)
+
+        rotation = np.identity(4, dtype=np.float32)
+        rotation[:3, :3] = rotation_matrix(self.angle_x, self.angle_y)
+        color = self.SPEAKING_COLOR if self.is_speaking else self.IDLE_COLOR
+
+        self._program.bind()
+        self._program.setUniformValue(self._u_rotation, QMatrix4x4(*rotation.ravel().tolist()))
+        self._program.setUniformValue(self._u_half_size, QVector2D(self.width() / 2, self.height() / 2))
+        self._program.setUniformValue1f(self._u_pulse, self.pulse_factor())
+        self._program.setUniformValue1f(self._u_dpr, self.devicePixelRatioF())
+        self._program.setUniformValue(self._u_color, color)
+        if self._vao.isCreated():
+            self._vao.bind()
+        else:
+            self._vbo.bind()
+            self._program.enableAttributeArray(0)
+            self._program.setAttributeBuffer(0, GL_FLOAT, 0, 3, 0)
+        f.glDrawArrays(GL_POINTS, 0, len(self.sphere_points_np))
+        if self._vao.isCreated(): self._vao.release()
+        else: self._vbo.release()
+        self._program.release()
+
+class VideoGLWindow(QOpenGLWindow):
+    """
+    Video preview as its own native GL surface, embedded with createWindowContainer.
+    Each frame's bytes go straight into one reused texture (glTexSubImage2D) and a
+    letterboxed quad samples it, so frames skip the QPixmap conversion and scaling.
+    """
+    CLEAR_COLOR = QColor("#000000") # Matches the QLabel preview background
+
+    VERTEX_SHADER = """
+        attribute highp vec2 a_corner;
+        uniform highp vec2 u_scale;
+        varying highp vec2 v_uv;
+        void main() {
+            v_uv = vec2(a_corner.x + 1.0, 1.0 - a_corner.y) * 0.5;
+            gl_Position = vec4(a_corner * u_scale, 0.0, 1.0);
+        }
+    """
 
-        projected_points.sort(key=lambda p: p[2])
-        
-        for x, y, point_size, alpha in projected_points:
-            color = QColor(170, 255, 255, alpha) if self.is_speaking else QColor(0, 255, 255, alpha)
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(QBrush(color))
-            painter.drawEllipse(int(x), int(y), int(point_size), int(point_size))
+    # Frames are BGR/BGRA bytes uploaded as RGB/RGBA, so swap the channels back here
+    FRAGMENT_SHADER = """
+        uniform sampler2D u_frame;
+        varying highp vec2 v_uv;
+        void main() {
+            gl_FragColor = vec4(texture2D(u_frame, v_uv).bgr, 1.0);
+        }
+    """
+
+    QUAD = np.array([-1, -1, 1, -1, -1, 1, 1, 1], dtype=np.float32) # Triangle strip
+
+    def __init__(self):
+        super().__init__() # NoPartialUpdate: every paint redraws the whole quad
+        self._program = None
+        self._vbo = None
+        self._vao = None
+        self._texture = None
+        self._frame_size = None # (width, height) of the frame in the texture, None when blank
+        self._ready = False
+
+    @staticmethod
+    def is_supported():
+        """True if the platform can create a GL context (offscreen/VNC platforms can't)."""
+        return QOpenGLContext().create()
+
+    def initializeGL(self):
+        ctx = self.context()
+        if ctx is None or not ctx.isValid(): return # QOpenGLWindow still calls this when context creation fails
+        version = "#version 100\n" if ctx.isOpenGLES() else "#version 120\n"
+        self._program = QOpenGLShaderProgram(self)
+        self._program.addShaderFromSourceCode(QOpenGLShader.Vertex, version + self.VERTEX_SHADER)
+        self._program.addShaderFromSourceCode(QOpenGLShader.Fragment, version + self.FRAGMENT_SHADER)
+        self._program.bindAttributeLocation("a_corner", 0)
+        if not self._program.link():
+            print(f">>> [ERROR] Video shader failed to link: {self._program.log()}")
+        self._u_scale = self._program.uniformLocation("u_scale")
+        self._u_frame = self._program.uniformLocation("u_frame")
+
+        self._vao = QOpenGLVertexArrayObject(self)
+        self._vao.create() # Only needed (and only succeeds) on core profiles
+        if self._vao.isCreated(): self._vao.bind()
+        data = self.QUAD.tobytes()
+        self._vbo = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+        self._vbo.create()
+        self._vbo.bind()
+        self._vbo.allocate(data, len(data))
+        self._program.enableAttributeArray(0)
+        self._program.setAttributeBuffer(0, GL_FLOAT, 0, 2, 0)
+        self._vbo.release()
+        if self._vao.isCreated(): self._vao.release()
+        ctx.functions().glClearColor(self.CLEAR_COLOR.redF(), self.CLEAR_COLOR.greenF(), self.CLEAR_COLOR.blueF(), 1.0)
+        self._ready = True
+
+    def resizeGL(self, w, h):
+        if not self._ready: return
+        dpr = self.devicePixelRatio()
+        self.context().functions().glViewport(0, 0, round(w * dpr), round(h * dpr))
+
+    def push_frame(self, image):
+        """Uploads a BGR888/RGB32 frame (or clears on a null image) and schedules a repaint."""
+        if not self._ready: return # Not exposed yet, nothing to draw into
+        if image.isNull():
+            self._frame_size = None
+            self.update(); return
+        w, h = image.width(), image.height()
+        ch = 3 if image.format() == QImage.Format_BGR888 else 4
+        self.makeCurrent() # Upload now, while the capture slot behind the image is still reserved for us
+        if self._texture is None or (self._texture.width(), self._texture.height()) != (w, h):
+            if self._texture is not None: self._texture.destroy()
+            self._texture = QOpenGLTexture(QOpenGLTexture.Target2D)
+            self._texture.setFormat(QOpenGLTexture.RGBA8_UNorm)
+            self._texture.setSize(w, h)
+            self._texture.setMinMagFilters(QOpenGLTexture.Linear, QOpenGLTexture.Linear)
+            self._texture.setWrapMode(QOpenGLTexture.ClampToEdge)
+            self._texture.allocateStorage()
+        options = QOpenGLPixelTransferOptions()
+        options.setAlignment(1) # BGR rows aren't padded to 4 bytes
+        if image.bytesPerLine() != w * ch: options.setRowLength(image.bytesPerLine() // ch)
+        self._texture.setData(QOpenGLTexture.RGB if ch == 3 else QOpenGLTexture.RGBA, QOpenGLTexture.UInt8,
+                              int(VoidPtr(image.constBits())), options)
+        self.doneCurrent()
+        self._frame_size = (w, h)
+        self.update()
+
+    def paintGL(self):
+        if not self._ready: return
+        f = self.context().functions()
+        f.glClear(GL_COLOR_BUFFER_BIT)
+        if self._frame_size is None or not self._program.isLinked():
+            return
+        # Fit the frame inside the window, keeping its aspect ratio
+        w, h = self._frame_size
+        img_aspect, win_aspect = w / h, max(1, self.width()) / max(1, self.height())
+        sx, sy = (1.0, win_aspect / img_aspect) if img_aspect > win_aspect else (img_aspect / win_aspect, 1.0)
+
+        self._program.bind()
+        self._program.setUniformValue(self._u_scale, QVector2D(sx, sy))
+        self._program.setUniformValue1i(self._u_frame, 0)
+        self._texture.bind(0)
+        if self._vao.isCreated():
+            self._vao.bind()
+        else:
+            self._vbo.bind()
+            self._program.enableAttributeArray(0)
+            self._program.setAttributeBuffer(0, GL_FLOAT, 0, 2, 0)
+        f.glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+        if self._vao.isCreated(): self._vao.release()
+        else: self._vbo.release()
+        self._texture.release(0)
+        self._program.release()
+
+class VideoFrameLabel(QLabel):
+    """
+    Software preview used when the GL window isn't available. The latest frame is
+    kept as a QImage and drawn scaled straight into the widget's backing store, so
+    no QPixmap is created or converted per frame.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._image = QImage()
+        self._fit_key, self._fit_rect = None, None # (frame size, contents rect) -> letterboxed target
+
+    def set_frame(self, image):
+        self._image = image
+        self.update()
+
+    def has_frame(self):
+        return not self._image.isNull()
+
+    def paintEvent(self, event):
+        super().paintEvent(event) # Styled background and border
+        if self._image.isNull(): return
+        area = self.contentsRect()
+        key = (self._image.width(), self._image.height(), area.x(), area.y(), area.width(), area.height())
+        if key != self._fit_key: # Only refit when the frame or the widget changes size
+            fit = self._image.size().scaled(area.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            self._fit_key, self._fit_rect = key, QStyle.alignedRect(self.layoutDirection(), Qt.AlignCenter, fit, area)
+        painter = QPainter(self)
+        painter.drawImage(self._fit_rect, self._image) # Nearest-neighbour scale, like FastTransformation
+        painter.end()
 
 # ==============================================================================
 # AI BACKEND LOGIC
 # ==============================================================================
+# Lowercased directory names never descended into by the file search and app index walks
+# (hidden ".name" directories are skipped separately)
+_PRUNE_DIRS = frozenset({'windows', 'system32', 'syswow64', 'winsxs', '$recycle.bin', 'programdata', 'node_modules',
+                         '.git', '__pycache__', '.cache', '.venv'})
+
+# --- App Launch/Close Tables (read-only, shared by every call) ---
+_WIN_APP_MAP = MappingProxyType({
+    "calculator": "calc.exe",
+    "notepad": "notepad.exe",
+    "paint": "mspaint.exe",
+    "wordpad": "write.exe",
+    "task manager": "taskmgr.exe",
+    "file explorer": "explorer.exe",
+    "explorer": "explorer.exe",
+    "cmd": "cmd.exe",
+    "command prompt": "cmd.exe",
+    "powershell": "powershell.exe",
+    "windows powershell": "powershell.exe",
+    "powershell 7": "pwsh.exe",
+    "pwsh": "pwsh.exe",
+    "terminal": "wt.exe",
+    "windows terminal": "wt.exe",
+    "git bash": "git-bash.exe",
+    "gitbash": "git-bash.exe",
+    "chrome": "chrome.exe",
+    "google chrome": "chrome.exe",
+    "firefox": "firefox.exe",
+    "brave": "brave.exe",
+    "brave browser": "brave.exe",
+    "edge": "msedge.exe",
+    "microsoft edge": "msedge.exe",
+    "obs": "obs64.exe",
+    "obs studio": "obs64.exe",
+    "vlc": "vlc.exe",
+    "discord": "discord.exe",
+    "spotify": "spotify.exe",
+    "steam": "steam.exe",
+    "epic games": "epicgameslauncher.exe",
+    "epic": "epicgameslauncher.exe",
+    "mumuplayer": "MuMuNxMain.exe",
+    "mumu": "MuMuNxMain.exe",
+    "mumu player": "MuMuNxMain.exe",
+    "vs code": "code.exe",
+    "vscode": "code.exe",
+    "visual studio code": "code.exe",
+    "word": "winword.exe",
+    "microsoft word": "winword.exe",
+    "excel": "excel.exe",
+    "microsoft excel": "excel.exe",
+    "powerpoint": "powerpnt.exe",
+    "snipping tool": "snippingtool.exe",
+    "teams": "ms-teams:",
+    "microsoft teams": "ms-teams:",
+    "outlook": "outlook.exe",
+    "microsoft outlook": "outlook.exe",
+    "skype": "skype.exe",
+    "zoom": "zoom.exe",
+    "telegram": "telegram.exe",
+    "whatsapp": "whatsapp.exe",
+    "filmora": "Wondershare Filmora Launcher.exe"
+})
+
+# These need a visible console window — Popen alone launches them invisibly
+_CONSOLE_APPS = frozenset({"cmd.exe", "powershell.exe", "pwsh.exe", "wt.exe", "git-bash.exe"})
+
+# Default-app launcher for files outside Windows, resolved once so opening a file skips the PATH search
+_FILE_OPENER = None if sys.platform == "win32" else shutil.which("open" if sys.platform == "darwin" else "xdg-open")
+
+_MAC_APP_MAP = MappingProxyType({"calculator": "Calculator", "chrome": "Google Chrome", "firefox": "Firefox", "finder": "Finder", "textedit": "TextEdit", "obs": "OBS", "obs studio": "OBS", "discord": "Discord", "spotify": "Spotify"})
+
+# Friendly app names to the process image names taskkill should target
+_WIN_PROCESS_MAP = MappingProxyType({
+    "chrome": ("chrome.exe",),
+    "google chrome": ("chrome.exe",),
+    "brave": ("brave.exe",),
+    "brave browser": ("brave.exe",),
+    "firefox": ("firefox.exe",),
+    "edge": ("msedge.exe",),
+    "microsoft edge": ("msedge.exe",),
+    "discord": ("discord.exe",),
+    "spotify": ("spotify.exe",),
+    "steam": ("steam.exe",),
+    "obs": ("obs64.exe",),
+    "obs studio": ("obs64.exe",),
+    "vlc": ("vlc.exe",),
+    "notepad": ("notepad.exe",),
+    "calculator": ("calculatorapp.exe", "calc.exe"),
+    "explorer": ("explorer.exe",),
+    "file explorer": ("explorer.exe",),
+    "task manager": ("taskmgr.exe",),
+    "cmd": ("cmd.exe",),
+    "command prompt": ("cmd.exe",),
+    "powershell": ("powershell.exe",),
+    "teams": ("ms-teams.exe", "teams.exe"),
+    "microsoft teams": ("ms-teams.exe", "teams.exe"),
+    "outlook": ("outlook.exe",),
+    "word": ("winword.exe",),
+    "microsoft word": ("winword.exe",),
+    "excel": ("excel.exe",),
+    "microsoft excel": ("excel.exe",),
+    "powerpoint": ("powerpnt.exe",),
+    "zoom": ("zoom.exe",),
+    "telegram": ("telegram.exe",),
+    "skype": ("skype.exe",),
+    "mumuplayer": ("MuMuNxMain.exe",),
+    "mumu": ("MuMuNxMain.exe",),
+    "mumu player": ("MuMuNxMain.exe",),
+    "epic games": ("epicgameslauncher.exe",),
+    "vs code": ("code.exe",),
+    "vscode": ("code.exe",),
+    "visual studio code": ("code.exe",),
+    "paint": ("mspaint.exe",),
+    "filmora": ("Filmora.exe",),
+    "whatsapp": ("whatsapp.exe",),
+})
+
+# Reverse index (exe stem -> image names), built once from the map above
+_WIN_PROCESS_BY_STEM = MappingProxyType({proc[:-4].lower(): procs for procs in _WIN_PROCESS_MAP.values() for proc in procs})
+
+def _resolve_win_processes(name_lower):
+    """Maps a spoken app name to the process image names to kill, by exact name or exe stem only."""
+    # No prefix guessing: every hit is force-killed, so a partial name must not reach an unrelated app
+    return _WIN_PROCESS_MAP.get(name_lower) or _WIN_PROCESS_BY_STEM.get(name_lower.removesuffix(".exe"))
+
+# --- Activity Log HTML (filled by the tool handlers with values escaped once each) ---
+_TOOL_TEMPLATES = MappingProxyType({
+    "create_folder": '<p style="color:{color};">{icon} <span style="color:#87CEEB;">{path}</span><br>'
+                     '<span style="color:#888; font-size:9pt;">{message}</span></p>',
+    "create_file": '<p style="color:{color};">📄 <span style="color:#87CEEB;">{path}</span><br>'
+                   '<span style="color:#888; font-size:9pt;">{lines} line(s) written &mdash; {message}</span></p>',
+    "edit_file": '<p style="color:{color};">✏ <span style="color:#87CEEB;">{path}</span><br>'
+                 '<span style="color:#888; font-size:9pt;">{message}</span></p>',
+    "read_file": '<p>📖 <span style="color:#87CEEB;">{path}</span></p>'
+                 '<p style="color:{color}; font-size:9pt; font-style:italic;">{preview}{more}</p>',
+    "app_launching": '<p>🚀 <span style="color:#00ffff; font-weight:bold;">{app}</span>'
+                     '<span style="color:#888;"> &mdash; initializing...</span></p>',
+    "app_launched": '<p style="color:{color};">{icon} <span style="color:#00ffff;">{app}</span> &mdash; {message}</p>',
+    "app_closing": '<p>⏹ Terminating <span style="color:#ff9944; font-weight:bold;">{app}</span>...</p>',
+    "app_closed": '<p style="color:{color};">{icon} <span style="color:#ff9944;">{app}</span> &mdash; {message}</p>',
+    "open_website": '<p>🌐 <a href="{url}" style="color:#00ffff; text-decoration:none;">{display}</a></p>'
+                    '<p style="color:{color}; font-size:9pt;">{message}</p>',
+    "open_direct_youtube": '<p>▶ <span style="color:#ff4444;">You</span><span style="color:#ffffff;">Tube</span>'
+                           ' &mdash; <span style="color:#00ffff;">{query}</span>'
+                           ' <span style="color:#888; font-size:9pt;">({ctype})</span></p>',
+    "search_and_open": '<p>🔍 <span style="color:{plat_color}; font-weight:bold;">{platform}</span>'
+                       ' &rarr; <span style="color:#00ffff;">{query}</span></p>'
+                       '<p style="color:#90EE90; font-size:9pt;">Opening best match...</p>',
+    "search_file": '<p>🔍 Scanning directories for <span style="color:#00ffff;">{filename}</span>...'
+                   '<br><span style="color:#888; font-size:9pt;">Desktop · Downloads · Documents · Videos · Music · Pictures</span></p>',
+    "locating_file": '<p>🔍 Locating <span style="color:#00ffff;">{filename}</span>...'
+                     '<br><span style="color:#888; font-size:9pt;">Scanning common folders...</span></p>',
+    "open_failed": '<p style="color:#ff6b6b;">⚠ {message}</p>',
+    "file_not_found": '<p style="color:#ff6b6b;">⚠ Could not locate <span style="color:#00ffff;">{filename}</span></p>',
+    "moving_file": '<p>📦 <span style="color:#00ffff;">{name}</span>'
+                   '<br><span style="color:#888; font-size:9pt;">{src}<br>&#8595; {dst}</span></p>',
+    "file_moved": '<p style="color:{color};">{icon} <span style="color:#00ffff;">{name}</span>'
+                  '<br><span style="color:#888; font-size:9pt;">&#8594; {dst}</span></p>',
+})
+
+# --- Gemini Live Session Config (built once, shared by every AI_Core) ---
+_TOOLS = [types.Tool(google_search=types.GoogleSearch()),
+    types.Tool(code_execution=types.ToolCodeExecution()),
+    types.Tool(function_declarations=[
+        types.FunctionDeclaration(name="create_folder", description="Creates a new folder.", parameters=types.Schema(type="OBJECT", properties={"folder_path": types.Schema(type="STRING")}, required=["folder_path"])),
+        types.FunctionDeclaration(name="create_file", description="Creates a new file with content.", parameters=types.Schema(type="OBJECT", properties={"file_path": types.Schema(type="STRING"), "content": types.Schema(type="STRING")}, required=["file_path", "content"])),
+        types.FunctionDeclaration(name="edit_file", description="Appends content to an existing file.", parameters=types.Schema(type="OBJECT", properties={"file_path": types.Schema(type="STRING"), "content": types.Schema(type="STRING")}, required=["file_path", "content"])),
+        types.FunctionDeclaration(name="list_files", description="Lists files in a directory.", parameters=types.Schema(type="OBJECT", properties={"directory_path": types.Schema(type="STRING")})),
+        types.FunctionDeclaration(name="read_file", description="Reads a file's content.", parameters=types.Schema(type="OBJECT", properties={"file_path": types.Schema(type="STRING")}, required=["file_path"])),
+        types.FunctionDeclaration(name="open_application", description="Opens a desktop application.", parameters=types.Schema(type="OBJECT", properties={"application_name": types.Schema(type="STRING")}, required=["application_name"])),
+        types.FunctionDeclaration(name="open_website", description="Opens a URL in the browser.", parameters=types.Schema(type="OBJECT", properties={"url": types.Schema(type="STRING")}, required=["url"])),
+        types.FunctionDeclaration(name="open_direct_youtube", description="Opens a YouTube search filtered by channel or video. Use when the user wants to find a specific YouTuber or video.", parameters=types.Schema(type="OBJECT", properties={"query": types.Schema(type="STRING"), "content_type": types.Schema(type="STRING", description="channel, video, or search")}, required=["query"])),
+        types.FunctionDeclaration(name="search_and_open", description="Finds and opens a person, channel, or topic on a platform directly. Use for requests like 'open Ejiogu Dennis on YouTube'.", parameters=types.Schema(type="OBJECT", properties={"query": types.Schema(type="STRING"), "platform": types.Schema(type="STRING", description="youtube or google")}, required=["query"])),
+        types.FunctionDeclaration(name="close_application", description="Closes a running application, browser, or program by name. Use when the user says 'close', 'exit', 'quit', or 'kill' an app.", parameters=types.Schema(type="OBJECT", properties={"application_name": types.Schema(type="STRING", description="The name of the app to close, e.g. Chrome, Discord, Spotify, Brave.")}, required=["application_name"])),
+        types.FunctionDeclaration(name="search_file", description="Searches for a file by name across Desktop, Downloads, Documents, Videos, Music and Pictures folders. Use when user asks to find a file.", parameters=types.Schema(type="OBJECT", properties={"filename": types.Schema(type="STRING", description="The filename or partial name to search for.")}, required=["filename"])),
+        types.FunctionDeclaration(name="open_file", description="Opens any file using the system default app. Works for mp4, exe, images, PDFs, etc. Can search automatically if full path unknown.", parameters=types.Schema(type="OBJECT", properties={"file_path": types.Schema(type="STRING", description="Full path to the file if known."), "filename": types.Schema(type="STRING", description="Filename to search for if full path unknown.")}, required=[])),
+        types.FunctionDeclaration(name="move_file", description="Moves or relocates a file from one location to another. Use when the user wants to move, relocate, or transfer a file to a different folder.", parameters=types.Schema(type="OBJECT", properties={"source_path": types.Schema(type="STRING", description="Full path of the file to move."), "destination_path": types.Schema(type="STRING", description="Destination folder or full file path. Accepts shortcuts like 'Desktop', 'Downloads', 'Documents', 'Videos', 'Music', 'Pictures'.")}, required=["source_path", "destination_path"])),
+    ])
+]
+
+_LIVE_CONFIG = types.LiveConnectConfig(
+    response_modalities=["AUDIO"],
+    speech_config=types.SpeechConfig(
+        voice_config=types.VoiceConfig(
+            prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=VOICE_TYPE)
+        )
+    ),
+    tools=_TOOLS,
+    system_instruction="""
+    Your name is Alyx and you are my AI assistant.
+    You have access to tools for searching, code execution, and system actions.
+    Your primary mode of communication is voice/audio.
+    Follow these guidelines:
+    1. For current information or facts, use Google Search.
+    2. When asked for current information or facts, direct the user to the browser with the requested query.
+    3. For math or code, use code_execution.
+    4. For file tasks, use create_folder, create_file, edit_file, list_files, or read_file.
+    5. To open a desktop app or game, use open_application.
+    6. To open a specific URL, use open_website.
+    7. To find and open a specific YouTuber or their channel, use search_and_open with platform=youtube. For example, if the user says 'open Ejiogu Dennis on YouTube', call search_and_open(query='Ejiogu Dennis', platform='youtube').
+    8. To search YouTube for videos or channels in general, use open_direct_youtube.
+    9. Never ask the user to switch screen modes or provide coordinates. Just use the appropriate tool directly.
+    10. You are receiving a continuous video feed from the user's screen or webcam. Do not comment on it unless the user asks.
+    11. You are receiving continuous images extracted from the video feed. Do not comment on them unless the user asks.
+    12. To close any running app, browser, or program, use close_application. Trigger on words like 'close', 'exit', 'quit', 'kill', or 'shut down' followed by an app name.
+    13. To find a file anywhere on the computer by name, use search_file.
+    14. To open any file such as a video, image, exe, or document, use open_file. The filename alone is sufficient.
+    15. For list_files, use shortcuts like 'desktop', 'downloads', 'documents', 'videos', 'music', or 'pictures' instead of full paths.
+    16. To move or relocate a file, use move_file. Folder shortcuts like 'Desktop' or 'Downloads' are accepted as destinations. If the user doesn't provide a full path, use search_file first to locate it, then move_file with the result.
+    17. When instructed to open an AI tool (e.g., Claude), navigate to its official website.
+    18. You are permitted to use profanity, including offensive or racial remarks, if the user explicitly asks.
+    19. You may sing any song, including copyrighted ones, but keep the lyrics under 100 words.
+    20. Do not open any browser links flagged as suspicious or dangerous, such as adult content sites, gambling sites, or known phishing/cloned sites."""
+)
+
+
+class DrainableQueue(asyncio.Queue):
+    """asyncio.Queue that can drop everything queued in one step (used to cut off stale replies)."""
+    def drain(self):
+        dropped = len(self._queue)
+        if not dropped: return
+        self._queue.clear()
+        # Drained items will never be task_done()'d; an item a consumer already took still will be
+        self._unfinished_tasks -= dropped
+        if self._unfinished_tasks == 0: self._finished.set()
+        for _ in range(dropped): self._wakeup_next(self._putters)
+
+
 class AI_Core(QObject):
     """
     Handles all backend operations. Inherits from QObject to emit signals
@@ -161,13 +876,13 @@ class AI_Core(QObject):
     """
     text_received = Signal(str)
     end_of_turn = Signal()
-    frame_received = Signal(QImage)
     search_results_received = Signal(list)
     code_being_executed = Signal(str, str)
-    file_list_received = Signal(str, list)
+    file_list_received = Signal(str, list)   # (directory, [(name, is_dir), ...])
     file_search_received = Signal(str, list)   # (query, matched_paths)
     file_opened_received = Signal(str)          # (opened_file_path)
-    tool_activity_received = Signal(str, str)  # (tag, html_body) — generic activity signal
+    tool_activity_received = Signal(str, str)  # (tag, html_body) — one in-progress block, sent immediately
+    tool_activity_batch_received = Signal(list) # [(tag, html_body), ...] from one batch of tool calls
     video_mode_changed = Signal(str)
     speaking_started = Signal()
     speaking_stopped = Signal()
@@ -181,151 +896,60 @@ class AI_Core(QObject):
         http_options={'api_version': 'v1beta'}
 )
 
-        create_folder = {
-            "name": "create_folder",
-            "description": "Creates a new folder at the specified path relative to the script's root directory.",
-            "parameters": {
-                "type": "OBJECT",
-                "properties": { "folder_path": { "type": "STRING", "description": "The path for the new folder (e.g., 'new_project/assets')."}},
-                "required": ["folder_path"]
-            }
-        }
-
-        create_file = {
-            "name": "create_file",
-            "description": "Creates a new file with specified content at a given path.",
-            "parameters": {
-                "type": "OBJECT",
-                "properties": {
-                    "file_path": { "type": "STRING", "description": "The path for the new file (e.g., 'new_project/notes.txt')."},
-                    "content": { "type": "STRING", "description": "The content to write into the new file."}
-                },
-                "required": ["file_path", "content"]
-            }
-        }
-
-        edit_file = {
-            "name": "edit_file",
-            "description": "Appends content to an existing file at a specified path.",
-            "parameters": {
-                "type": "OBJECT",
-                "properties": {
-                    "file_path": { "type": "STRING", "description": "The path of the file to edit (e.g., 'project/notes.txt')."},
-                    "content": { "type": "STRING", "description": "The content to append to the file."}
-                },
-                "required": ["file_path", "content"]
-            }
-        }
-
-        list_files = {
-            "name": "list_files",
-            "description": "Lists all files and directories within a specified folder. Defaults to the current directory if no path is provided.",
-            "parameters": {
-                "type": "OBJECT",
-                "properties": {
-                    "directory_path": { "type": "STRING", "description": "The path of the directory to inspect. Defaults to '.' (current directory) if omitted."}
-                }
-            }
-        }
-
-        read_file = {
-            "name": "read_file",
-            "description": "Reads the entire content of a specified file.",
-            "parameters": {
-                "type": "OBJECT",
-                "properties": {
-                    "file_path": { "type": "STRING", "description": "The path of the file to read (e.g., 'project/notes.txt')."}
-                },
-                "required": ["file_path"]
-            }
-        }
-
-        open_application = {
-            "name": "open_application",
-            "description": "Opens or launches a desktop application on the user's computer.",
-            "parameters": {
-                "type": "OBJECT",
-                "properties": {
-                    "application_name": { "type": "STRING", "description": "The name of the application to open (e.g., 'Notepad', 'Calculator', 'Chrome')."}
-                },
-                "required": ["application_name"]
-            }
-        }
-
-        open_website = {
-            "name": "open_website",
-            "description": "Opens a given URL in the default web browser.",
-            "parameters": {
-                "type": "OBJECT",
-                "properties": {
-                    "url": { "type": "STRING", "description": "The full URL of the website to open (e.g., 'https://www.google.com')."}
-                },
-                "required": ["url"]
-            }
-        }
-        
-        tools = [types.Tool(google_search=types.GoogleSearch()),
-            types.Tool(code_execution=types.ToolCodeExecution()),
-            types.Tool(function_declarations=[
-                types.FunctionDeclaration(name="create_folder", description="Creates a new folder.", parameters=types.Schema(type="OBJECT", properties={"folder_path": types.Schema(type="STRING")}, required=["folder_path"])),
-                types.FunctionDeclaration(name="create_file", description="Creates a new file with content.", parameters=types.Schema(type="OBJECT", properties={"file_path": types.Schema(type="STRING"), "content": types.Schema(type="STRING")}, required=["file_path", "content"])),
-                types.FunctionDeclaration(name="edit_file", description="Appends content to an existing file.", parameters=types.Schema(type="OBJECT", properties={"file_path": types.Schema(type="STRING"), "content": types.Schema(type="STRING")}, required=["file_path", "content"])),
-                types.FunctionDeclaration(name="list_files", description="Lists files in a directory.", parameters=types.Schema(type="OBJECT", properties={"directory_path": types.Schema(type="STRING")})),
-                types.FunctionDeclaration(name="read_file", description="Reads a file's content.", parameters=types.Schema(type="OBJECT", properties={"file_path": types.Schema(type="STRING")}, required=["file_path"])),
-                types.FunctionDeclaration(name="open_application", description="Opens a desktop application.", parameters=types.Schema(type="OBJECT", properties={"application_name": types.Schema(type="STRING")}, required=["application_name"])),
-                types.FunctionDeclaration(name="open_website", description="Opens a URL in the browser.", parameters=types.Schema(type="OBJECT", properties={"url": types.Schema(type="STRING")}, required=["url"])),
-                types.FunctionDeclaration(name="open_direct_youtube", description="Opens a YouTube search filtered by channel or video. Use when the user wants to find a specific YouTuber or video.", parameters=types.Schema(type="OBJECT", properties={"query": types.Schema(type="STRING"), "content_type": types.Schema(type="STRING", description="channel, video, or search")}, required=["query"])),
-                types.FunctionDeclaration(name="search_and_open", description="Finds and opens a person, channel, or topic on a platform directly. Use for requests like 'open Ejiogu Dennis on YouTube'.", parameters=types.Schema(type="OBJECT", properties={"query": types.Schema(type="STRING"), "platform": types.Schema(type="STRING", description="youtube or google")}, required=["query"])),
-                types.FunctionDeclaration(name="close_application", description="Closes a running application, browser, or program by name. Use when the user says 'close', 'exit', 'quit', or 'kill' an app.", parameters=types.Schema(type="OBJECT", properties={"application_name": types.Schema(type="STRING", description="The name of the app to close, e.g. Chrome, Discord, Spotify, Brave.")}, required=["application_name"])),
-                types.FunctionDeclaration(name="search_file", description="Searches for a file by name across Desktop, Downloads, Documents, Videos, Music and Pictures folders. Use when user asks to find a file.", parameters=types.Schema(type="OBJECT", properties={"filename": types.Schema(type="STRING", description="The filename or partial name to search for.")}, required=["filename"])),
-                types.FunctionDeclaration(name="open_file", description="Opens any file using the system default app. Works for mp4, exe, images, PDFs, etc. Can search automatically if full path unknown.", parameters=types.Schema(type="OBJECT", properties={"file_path": types.Schema(type="STRING", description="Full path to the file if known."), "filename": types.Schema(type="STRING", description="Filename to search for if full path unknown.")}, required=[])),
-                types.FunctionDeclaration(name="move_file", description="Moves or relocates a file from one location to another. Use when the user wants to move, relocate, or transfer a file to a different folder.", parameters=types.Schema(type="OBJECT", properties={"source_path": types.Schema(type="STRING", description="Full path of the file to move."), "destination_path": types.Schema(type="STRING", description="Destination folder or full file path. Accepts shortcuts like 'Desktop', 'Downloads', 'Documents', 'Videos', 'Music', 'Pictures'.")}, required=["source_path", "destination_path"])),
-            ])
-        ]
-
-        self.config = types.LiveConnectConfig(
-            response_modalities=["AUDIO"],
-            speech_config=types.SpeechConfig(
-                voice_config=types.VoiceConfig(
-                    prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=VOICE_TYPE)
-                )
-            ),
-            tools=tools,
-            system_instruction="""
-            Your name is Alyx and you are my AI assistant.
-            You have access to tools for searching, code execution, and system actions.
-            Your primary mode of communication is voice/audio.
-            Follow these guidelines:
-            1. For current information or facts, use Google Search.
-            2. When asked for current information or facts, direct the user to the browser with the requested query.
-            3. For math or code, use code_execution.
-            4. For file tasks, use create_folder, create_file, edit_file, list_files, or read_file.
-            5. To open a desktop app or game, use open_application.
-            6. To open a specific URL, use open_website.
-            7. To find and open a specific YouTuber or their channel, use search_and_open with platform=youtube. For example, if the user says 'open Ejiogu Dennis on YouTube', call search_and_open(query='Ejiogu Dennis', platform='youtube').
-            8. To search YouTube for videos or channels in general, use open_direct_youtube.
-            9. Never ask the user to switch screen modes or provide coordinates. Just use the appropriate tool directly.
-            10. You are receiving a continuous video feed from the user's screen or webcam. Do not comment on it unless the user asks.
-            11. You are receiving continuous images extracted from the video feed. Do not comment on them unless the user asks.
-            12. To close any running app, browser, or program, use close_application. Trigger on words like 'close', 'exit', 'quit', 'kill', or 'shut down' followed by an app name.
-            13. To find a file anywhere on the computer by name, use search_file.
-            14. To open any file such as a video, image, exe, or document, use open_file. The filename alone is sufficient.
-            15. For list_files, use shortcuts like 'desktop', 'downloads', 'documents', 'videos', 'music', or 'pictures' instead of full paths.
-            16. To move or relocate a file, use move_file. Folder shortcuts like 'Desktop' or 'Downloads' are accepted as destinations. If the user doesn't provide a full path, use search_file first to locate it, then move_file with the result.
-            17. When instructed to open an AI tool (e.g., Claude), navigate to its official website.
-            18. You are permitted to use profanity, including offensive or racial remarks, if the user explicitly asks.
-            19. You may sing any song, including copyrighted ones, but keep the lyrics under 100 words.
-            20. Do not open any browser links flagged as suspicious or dangerous, such as adult content sites, gambling sites, or known phishing/cloned sites."""
-        )
+        self.config = _LIVE_CONFIG
         self.session = None
         self.audio_stream = None
-        self.out_queue_gemini = asyncio.Queue(maxsize=20)
-        self.response_queue_tts = asyncio.Queue()
-        self.audio_in_queue_player = asyncio.Queue()
+        self.out_queue_gemini = asyncio.Queue(maxsize=GEMINI_QUEUE_SIZE)
+        self._queued_image = None # Image message still waiting in out_queue_gemini; newer frames replace its data
+        self.gemini_dropped = 0
+        self.response_queue_tts = DrainableQueue()
+        self.audio_in_queue_player = DrainableQueue()
+        self._play_buf = deque(maxlen=PLAYBACK_QUEUE_MAX) # Reply audio the speaker callback drains; full = drop oldest
+        self._play_offset = 0 # Bytes of _play_buf[0] already played
+        self._play_lock = threading.Lock()
         self.text_input_queue = asyncio.Queue()
         self.latest_frame = None
+        self._frame_pending = False # A published preview frame the GUI hasn't painted yet
+        self._frame_lock = threading.Lock()
+        self._preview_image = None # Latest preview QImage, taken by the GUI's frame pump
+        self._frame_slots, self._slot_idx, self._pending_slot = None, 0, None # Camera capture buffers
+        self._shown_slot = None # Slot the software preview is still drawing from
+        self._encoding_slot = None # Slot the Gemini encoder is reading, kept out of rotation
+        self._slot_lock = threading.Lock() # Orders slot reservations against the capture worker's pick
+        self._encode_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-encode")
+        # One walker per user folder, kept for the session instead of a fresh pool per search
+        self._search_pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(USER_DIRS), thread_name_prefix="file-search")
+        self._screen_local = threading.local() # Per-thread mss instance for screen mode
+        self.camera_frame_skip = 0
+        self.gemini_frame_small = None
+        self._app_index = None # Lazily built by _get_app_index on the first app lookup miss
+        self._app_index_built = False # True once this session walked the disk (not just loaded the cache)
+        self._activity_batch = [] # Tool activity blocks waiting for _flush_activity
+        self._text_buf, self._text_flush_handle = [], None
+        self._search_cache = OrderedDict() # filename.lower() -> (monotonic time, matches), oldest first
+        self._search_cache_lock = threading.Lock() # Searches run on worker threads
+        # Tool name -> handler; every handler takes the call args and returns the response dict
+        self._tool_dispatch = {
+            "create_folder": self._tool_create_folder,
+            "create_file": self._tool_create_file,
+            "edit_file": self._tool_edit_file,
+            "list_files": self._tool_list_files,
+            "read_file": self._tool_read_file,
+            "open_application": self._tool_open_application,
+            "close_application": self._tool_close_application,
+            "open_website": self._tool_open_website,
+            "open_direct_youtube": self._tool_open_direct_youtube,
+            "search_and_open": self._tool_search_and_open,
+            "search_file": self._tool_search_file,
+            "open_file": self._tool_open_file,
+            "move_file": self._tool_move_file,
+        }
+        # Platform-specific launch/close implementations, picked once instead of per call
+        platform = "win32" if sys.platform == "win32" else "darwin" if sys.platform == "darwin" else "linux"
+        self._open_app_impl = getattr(self, f"_open_app_{platform}")
+        self._close_app_impl = getattr(self, f"_close_app_{platform}")
         self.tasks = []
-        self.loop = asyncio.new_event_loop()
+        self.loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
 
     def _create_folder(self, folder_path):
         try:
@@ -339,7 +963,9 @@ class AI_Core(QObject):
         try:
             if not file_path or not isinstance(file_path, str): return {"status": "error", "message": "Invalid file path provided."}
             if os.path.exists(file_path): return {"status": "skipped", "message": f"The file '{file_path}' already exists."}
-            with open(file_path, 'w') as f: f.write(content)
+            # Text mode keeps the platform newline translation (CRLF on Windows)
+            with open(file_path, 'w', encoding='utf-8', buffering=FILE_IO_BUFFER) as f: f.write(content)
+            self._invalidate_search_cache()
             return {"status": "success", "message": f"Successfully created the file at '{file_path}'."}
         except Exception as e: return {"status": "error", "message": f"An error occurred while creating the file: {str(e)}"}
 
@@ -347,7 +973,7 @@ class AI_Core(QObject):
         try:
             if not file_path or not isinstance(file_path, str): return {"status": "error", "message": "Invalid file path provided."}
             if not os.path.exists(file_path): return {"status": "error", "message": f"The file '{file_path}' does not exist. Please create it first."}
-            with open(file_path, 'a') as f: f.write(f"\n{content}")
+            with open(file_path, 'a', encoding='utf-8', buffering=FILE_IO_BUFFER) as f: f.write(f"\n{content}")
             return {"status": "success", "message": f"Successfully appended content to the file at '{file_path}'."}
         except Exception as e: return {"status": "error", "message": f"An error occurred while editing the file: {str(e)}"}
 
@@ -356,8 +982,10 @@ class AI_Core(QObject):
             path_to_list = directory_path if directory_path else '.'
             if not isinstance(path_to_list, str): return {"status": "error", "message": "Invalid directory path provided."}
             if not os.path.isdir(path_to_list): return {"status": "error", "message": f"The path '{path_to_list}' is not a valid directory."}
-            files = os.listdir(path_to_list)
-            return {"status": "success", "message": f"Found {len(files)} items in '{path_to_list}'.", "files": files, "directory_path": path_to_list}
+            # Entry types come from the same scandir pass, so the GUI never has to stat them
+            with os.scandir(path_to_list) as it: entries = [(entry.name, entry.is_dir()) for entry in it]
+            files = [name for name, _ in entries]
+            return {"status": "success", "message": f"Found {len(files)} items in '{path_to_list}'.", "files": files, "directory_path": path_to_list, "entries": entries}
         except Exception as e: return {"status": "error", "message": f"An error occurred: {str(e)}"}
 
     def _read_file(self, file_path):
@@ -365,12 +993,15 @@ class AI_Core(QObject):
             if not file_path or not isinstance(file_path, str): return {"status": "error", "message": "Invalid file path provided."}
             if not os.path.exists(file_path): return {"status": "error", "message": f"The file '{file_path}' does not exist."}
             if not os.path.isfile(file_path): return {"status": "error", "message": f"The path '{file_path}' is not a file."}
-            with open(file_path, 'r') as f: content = f.read()
+            # Capped so a huge log can't stall the tool call or flood the model's context
+            with open(file_path, 'rb', buffering=FILE_IO_BUFFER) as f: data = f.read(MAX_READ_BYTES + 1)
+            content = data[:MAX_READ_BYTES].decode('utf-8', 'replace').replace('\r\n', '\n')
+            if len(data) > MAX_READ_BYTES:
+                return {"status": "success", "message": f"Read the first {MAX_READ_BYTES // 1024} KiB of '{file_path}'; the rest was truncated.", "content": content, "truncated": True}
             return {"status": "success", "message": f"Successfully read the file '{file_path}'.", "content": content}
         except Exception as e: return {"status": "error", "message": f"An error occurred while reading the file: {str(e)}"}
 
     def _move_file(self, source_path, destination_path):
-        import shutil
         try:
             if not source_path or not isinstance(source_path, str):
                 return {"status": "error", "message": "Invalid source path provided."}
@@ -379,166 +1010,206 @@ class AI_Core(QObject):
             if not os.path.exists(source_path):
                 return {"status": "error", "message": f"Source '{source_path}' does not exist."}
             # Expand common shortcuts like Desktop, Downloads, etc.
-            home = os.path.expanduser("~")
-            shortcuts = {
-                "desktop": os.path.join(home, "Desktop"),
-                "downloads": os.path.join(home, "Downloads"),
-                "documents": os.path.join(home, "Documents"),
-                "videos": os.path.join(home, "Videos"),
-                "music": os.path.join(home, "Music"),
-                "pictures": os.path.join(home, "Pictures"),
-            }
-            dest_lower = destination_path.strip().lower()
-            if dest_lower in shortcuts:
-                destination_path = shortcuts[dest_lower]
+            destination_path = USER_DIRS.get(destination_path.strip().lower(), destination_path)
             # If destination is a directory, move into it keeping the original filename
             if os.path.isdir(destination_path):
                 destination_path = os.path.join(destination_path, os.path.basename(source_path))
             # Create any missing parent directories
-            os.makedirs(os.path.dirname(os.path.abspath(destination_path)), exist_ok=True)
-            shutil.move(source_path, destination_path)
+            abs_dst = os.path.abspath(destination_path)
+            parent = os.path.dirname(abs_dst)
+            if parent: os.makedirs(parent, exist_ok=True)
+            # Same volume: a single rename; shutil.move's copy+delete is only needed across devices
+            try:
+                if os.stat(source_path).st_dev == os.stat(parent).st_dev: os.replace(source_path, abs_dst)
+                else: shutil.move(source_path, abs_dst)
+            except OSError:
+                shutil.move(source_path, abs_dst)
+            self._invalidate_search_cache()
             return {"status": "success", "message": f"Moved to '{destination_path}'.", "destination": destination_path}
         except Exception as e:
             return {"status": "error", "message": f"Failed to move file: {str(e)}"}
 
+    def _open_file(self, file_path):
+        """Opens a file with the system's default application."""
+        try:
+            if sys.platform == "win32":
+                os.startfile(file_path)
+            elif _FILE_OPENER:
+                subprocess.Popen([_FILE_OPENER, file_path])
+            else:
+                return {"status": "error", "message": "No default file opener (xdg-open) is installed."}
+            return {"status": "success", "message": f"Opened '{os.path.basename(file_path)}' successfully."}
+        except FileNotFoundError:
+            return {"status": "not_found", "message": f"File not found: '{file_path}'."}
+        except Exception as e:
+            return {"status": "error", "message": f"Failed to open file: {str(e)}"}
+
     def _search_file_sync(self, filename):
         """Synchronous file search — called via asyncio.to_thread to avoid blocking."""
-        home = os.path.expanduser("~")
-        search_roots = [
-            os.path.join(home, "Desktop"),
-            os.path.join(home, "Downloads"),
-            os.path.join(home, "Documents"),
-            os.path.join(home, "Videos"),
-            os.path.join(home, "Music"),
-            os.path.join(home, "Pictures"),
-            home,
-        ]
+        # Repeat lookups within SEARCH_CACHE_TTL are served from an LRU instead of re-walking the disk
+        key, now = filename.lower(), time.monotonic()
+        with self._search_cache_lock:
+            cached = self._search_cache.get(key)
+            if cached and now - cached[0] < SEARCH_CACHE_TTL:
+                self._search_cache.move_to_end(key)
+                return [path for path in cached[1] if os.path.exists(path)]
+        matches = self._search_file_walk(filename)
+        with self._search_cache_lock:
+            self._search_cache[key] = (now, matches)
+            self._search_cache.move_to_end(key)
+            if len(self._search_cache) > SEARCH_CACHE_SIZE: self._search_cache.popitem(last=False)
+        return list(matches)
+
+    def _invalidate_search_cache(self):
+        with self._search_cache_lock: self._search_cache.clear()
+
+    def _search_file_walk(self, filename):
+        needle = filename.lower()
+        roots = [r for r in USER_DIRS.values() if os.path.isdir(r)]
+        # The user folders are walked concurrently (scandir releases the GIL); results are merged in root order
+        cancel = threading.Event()
+        futures = [self._search_pool.submit(self._search_one_root, root, needle, frozenset(), cancel) for root in roots]
+        matches = []
+        try:
+            for future in futures:
+                matches.extend(future.result())
+                if len(matches) >= 5: return matches[:5]
+        finally:
+            cancel.set() # Stops walkers whose results are no longer needed
+        # Only then the rest of home, by far the largest tree, on this thread so it doesn't compete for the disk
+        if os.path.isdir(HOME):
+            skip = frozenset(USER_DIRS.values()) # Already searched above
+            matches.extend(self._search_one_root(HOME, needle, skip, threading.Event(), limit=5 - len(matches)))
+        return matches
+
+    def _search_one_root(self, root_dir, needle, skip, cancel, limit=5):
+        """Depth-first scandir walk of one root; stops at limit matches or when cancel is set."""
         matches = []
-        for root_dir in search_roots:
-            if not root_dir or not os.path.isdir(root_dir): continue
-            for root, dirs, files in os.walk(root_dir):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in
-                            ['Windows', 'System32', 'SysWOW64', 'WinSxS', '$Recycle.Bin', 'ProgramData', 'node_modules']]
-                for f in files:
-                    if filename.lower() in f.lower():
-                        matches.append(os.path.join(root, f))
-                if len(matches) >= 5:
-                    return matches
+        stack = [root_dir]
+        while stack and not cancel.is_set():
+            subdirs = []
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if cancel.is_set(): return matches # Don't finish a big directory for nobody
+                        name = entry.name
+                        try:
+                            if entry.is_dir():
+                                # The home walk is given the folders searched separately so it can skip them
+                                if (name[:1] != '.' and name.lower() not in _PRUNE_DIRS and not entry.is_symlink()
+                                        and entry.path not in skip):
+                                    subdirs.append(entry.path)
+                            elif needle in name.lower(): # Plain substring test; a compiled re.I search measured ~3x slower
+                                matches.append(entry.path)
+                                if len(matches) >= limit: return matches
+                        except OSError: continue
+            except OSError: continue
+            stack.extend(reversed(subdirs)) # Pop them in listing order, like os.walk
         return matches
 
+    def _get_app_index(self, search_dirs, refresh=False):
+        """Returns the {exe_name_lower: full_path} index, loading or rebuilding the on-disk cache once.
+        refresh=True re-walks the disk if the index in memory only came from the cache."""
+        if self._app_index is not None and (not refresh or self._app_index_built): return self._app_index
+        cache_path = os.path.join(LOCAL_APPDATA or HOME, "alyx", "app_index.json")
+        # Created up front because LocalAppData is itself a search root and mkdir would bump its mtime
+        try: os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        except OSError: pass
+        # The cache is keyed on the search roots' mtimes. That catches apps added or removed directly under a
+        # root, but not installs or updates inside an existing vendor folder (Program Files\Vendor\NewApp),
+        # so a lookup miss or a vanished path makes the caller ask for one refresh before falling back
+        mtimes = {}
+        for d in search_dirs:
+            try: mtimes[d] = os.stat(d).st_mtime
+            except OSError: continue
+        if not refresh:
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f: cached = json_loads(f.read())
+                if cached.get("mtimes") == mtimes: self._app_index = cached["index"]
+            except (OSError, ValueError, KeyError): pass
+        if self._app_index is None or refresh:
+            self._app_index = self._build_app_index(search_dirs)
+            self._app_index_built = True
+            try:
+                with open(cache_path, "w", encoding="utf-8") as f: f.write(json_dumps({"mtimes": mtimes, "index": self._app_index}))
+            except OSError as e: print(f">>> [WARN] Could not save the app index: {e}")
+        return self._app_index
+
+    def _build_app_index(self, search_dirs):
+        """Scandir-walks the install locations once and maps every .exe name to its first path."""
+        index, walked = {}, []
+        for d in search_dirs:
+            if not d or not os.path.isdir(d): continue
+            d = os.path.normcase(os.path.abspath(d))
+            if any(d == w or d.startswith(w + os.sep) for w in walked): continue # Already covered by a parent root
+            walked.append(d)
+            stack = [d]
+            while stack:
+                subdirs = []
+                try:
+                    with os.scandir(stack.pop()) as it:
+                        for entry in it:
+                            name = entry.name
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    if name[:1] != '.' and name.lower() not in _PRUNE_DIRS: subdirs.append(entry.path)
+                                elif name[-4:].lower() == ".exe": # Only lowercase the full name for actual hits
+                                    index.setdefault(name.lower(), entry.path)
+                            except OSError: continue
+                except OSError: continue
+                stack.extend(reversed(subdirs))
+        return index
+
     def _open_application(self, application_name):
         print(f">>> [DEBUG] Attempting to open application: '{application_name}'")
         try:
             if not application_name or not isinstance(application_name, str):
                 return {"status": "error", "message": "Invalid application name provided."}
             name_lower = application_name.lower().strip()
-            if sys.platform == "win32":
-                app_map = {
-                    "calculator": "calc.exe",
-                    "notepad": "notepad.exe",
-                    "paint": "mspaint.exe",
-                    "wordpad": "write.exe",
-                    "task manager": "taskmgr.exe",
-                    "file explorer": "explorer.exe",
-                    "explorer": "explorer.exe",
-                    "cmd": "cmd.exe",
-                    "command prompt": "cmd.exe",
-                    "powershell": "powershell.exe",
-                    "windows powershell": "powershell.exe",
-                    "powershell 7": "pwsh.exe",
-                    "pwsh": "pwsh.exe",
-                    "terminal": "wt.exe",
-                    "windows terminal": "wt.exe",
-                    "git bash": "git-bash.exe",
-                    "gitbash": "git-bash.exe",
-                    "chrome": "chrome.exe",
-                    "google chrome": "chrome.exe",
-                    "firefox": "firefox.exe",
-                    "brave": "brave.exe",
-                    "brave browser": "brave.exe",
-                    "edge": "msedge.exe",
-                    "microsoft edge": "msedge.exe",
-                    "obs": "obs64.exe",
-                    "obs studio": "obs64.exe",
-                    "vlc": "vlc.exe",
-                    "discord": "discord.exe",
-                    "spotify": "spotify.exe",
-                    "steam": "steam.exe",
-                    "epic games": "epicgameslauncher.exe",
-                    "epic": "epicgameslauncher.exe",
-                    "mumuplayer": "MuMuNxMain.exe",
-                    "mumu": "MuMuNxMain.exe",
-                    "mumu player": "MuMuNxMain.exe",
-                    "vs code": "code.exe",
-                    "vscode": "code.exe",
-                    "visual studio code": "code.exe",
-                    "word": "winword.exe",
-                    "microsoft word": "winword.exe",
-                    "excel": "excel.exe",
-                    "microsoft excel": "excel.exe",
-                    "powerpoint": "powerpnt.exe",
-                    "snipping tool": "snippingtool.exe",
-                    "teams": "ms-teams:",
-                    "microsoft teams": "ms-teams:",
-                    "outlook": "outlook.exe",
-                    "microsoft outlook": "outlook.exe",
-                    "skype": "skype.exe",
-                    "zoom": "zoom.exe",
-                    "telegram": "telegram.exe",
-                    "whatsapp": "whatsapp.exe",
-                    "filmora": "Wondershare Filmora Launcher.exe"
-                }
-
-                # These need a visible console window — Popen alone launches them invisibly
-                CONSOLE_APPS = {"cmd.exe", "powershell.exe", "pwsh.exe", "wt.exe", "git-bash.exe"}
-
-                exe = app_map.get(name_lower)
-                if exe:
-                    # URI protocols (like ms-teams:)
-                    if exe.endswith(":"):
-                        subprocess.Popen(f"start {exe}", shell=True)
-                        return {"status": "success", "message": f"Successfully launched '{application_name}'."}
-                    # Console/terminal apps must use 'start' to get a visible window
-                    if exe.lower() in CONSOLE_APPS:
-                        subprocess.Popen(f'start "" "{exe}"', shell=True)
-                        return {"status": "success", "message": f"Successfully launched '{application_name}'."}
-                    # Standard GUI apps — try direct launch first (works if in PATH)
-                    try:
-                        subprocess.Popen(exe, shell=False)
-                        return {"status": "success", "message": f"Successfully launched '{application_name}'."}
-                    except FileNotFoundError:
-                        pass
-                    # Search common install locations
-                    search_dirs = [
-                        os.environ.get("ProgramFiles", "C:\\Program Files"),
-                        os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"),
-                        os.environ.get("LocalAppData", ""),
-                        os.path.join(os.environ.get("LocalAppData", ""), "Programs"),
-                        os.path.join(os.environ.get("AppData", ""), "..\\Local\\Programs"),
-                        os.path.join(os.environ.get("AppData", ""), "Local\\Programs"),
-                    ]
-                    for d in search_dirs:
-                        if not d or not os.path.isdir(d): continue
-                        for root, dirs, files in os.walk(d):
-                            if exe.lower() in [f.lower() for f in files]:
-                                full_path = os.path.join(root, exe)
-                                subprocess.Popen(full_path, shell=False)
-                                return {"status": "success", "message": f"Launched '{application_name}' from {full_path}."}
-                    # Last resort: use start command with proper quoting
-                    subprocess.Popen(f'start "" "{exe}"', shell=True)
-                    return {"status": "success", "message": f"Attempted to launch '{application_name}'."}
-                else:
-                    subprocess.Popen(f'start "" "{application_name}"', shell=True)
-                    return {"status": "success", "message": f"Attempted to launch '{application_name}'."}
-            elif sys.platform == "darwin":
-                app_map = {"calculator": "Calculator", "chrome": "Google Chrome", "firefox": "Firefox", "finder": "Finder", "textedit": "TextEdit", "obs": "OBS", "obs studio": "OBS", "discord": "Discord", "spotify": "Spotify"}
-                app_name = app_map.get(name_lower, application_name)
-                subprocess.Popen(["open", "-a", app_name])
+            return self._open_app_impl(application_name, name_lower)
+        except Exception as e: return {"status": "error", "message": f"An error occurred: {str(e)}"}
+
+    def _open_app_win32(self, application_name, name_lower):
+        """Launches from the app tables, the cached install index, then ShellExecute."""
+        exe = _WIN_APP_MAP.get(name_lower)
+        if exe:
+            # URI protocols (like ms-teams:) go straight to ShellExecute
+            if exe.endswith(":"):
+                os.startfile(exe)
                 return {"status": "success", "message": f"Successfully launched '{application_name}'."}
-            else:
-                subprocess.Popen([name_lower])
+            # Console/terminal apps need their own console window to be visible
+            if exe.lower() in _CONSOLE_APPS:
+                try: subprocess.Popen([exe], creationflags=subprocess.CREATE_NEW_CONSOLE)
+                except FileNotFoundError: os.startfile(exe) # Not on PATH; ShellExecute also checks App Paths
                 return {"status": "success", "message": f"Successfully launched '{application_name}'."}
-        except Exception as e: return {"status": "error", "message": f"An error occurred: {str(e)}"}
+            # Standard GUI apps — try direct launch first (works if in PATH)
+            try:
+                subprocess.Popen(exe, shell=False)
+                return {"status": "success", "message": f"Successfully launched '{application_name}'."}
+            except FileNotFoundError:
+                pass
+            # Search common install locations
+            full_path = self._get_app_index(WIN_SEARCH_DIRS).get(exe.lower())
+            if not (full_path and os.path.isfile(full_path)): # Possibly a stale cache: re-walk once
+                full_path = self._get_app_index(WIN_SEARCH_DIRS, refresh=True).get(exe.lower())
+            if full_path and os.path.isfile(full_path):
+                subprocess.Popen(full_path, shell=False)
+                return {"status": "success", "message": f"Launched '{application_name}' from {full_path}."}
+        # Last resort: let ShellExecute resolve it (App Paths registry, PATH) without spawning cmd.exe
+        try: os.startfile(exe or application_name)
+        except OSError: return {"status": "error", "message": f"Could not find an application named '{application_name}'."}
+        return {"status": "success", "message": f"Attempted to launch '{application_name}'."}
+
+    def _open_app_darwin(self, application_name, name_lower):
+        """Launches through `open -a` with the macOS app names."""
+        app_name = _MAC_APP_MAP.get(name_lower, application_name)
+        subprocess.Popen(["open", "-a", app_name])
+        return {"status": "success", "message": f"Successfully launched '{application_name}'."}
+
+    def _open_app_linux(self, application_name, name_lower):
+        """Launches the lowercased name as a command on PATH."""
+        subprocess.Popen([name_lower])
+        return {"status": "success", "message": f"Successfully launched '{application_name}'."}
 
     def _open_direct_youtube(self, query, content_type="channel"):
         """Uses a direct YouTube search URL to find and open a channel, video, or search result."""
@@ -546,7 +1217,7 @@ class AI_Core(QObject):
         try:
             if not query or not isinstance(query, str):
                 return {"status": "error", "message": "Invalid query."}
-            encoded = query.replace(" ", "+")
+            encoded = quote_plus(query)
             if content_type == "channel":
                 # Search for the channel specifically
                 url = f"https://www.youtube.com/results?search_query={encoded}&sp=EgIQAg%253D%253D"
@@ -565,10 +1236,10 @@ class AI_Core(QObject):
         try:
             if not query or not isinstance(query, str):
                 return {"status": "error", "message": "Invalid query."}
-            encoded = query.replace(" ", "+")
+            encoded = quote_plus(query)
             if platform == "youtube":
                 # Open YouTube search filtered to channels
-                url = f"https://www.youtube.com/@{query.replace(' ', '')}"
+                url = f"https://www.youtube.com/@{quote(query.replace(' ', ''), safe='')}"
                 # Try the @ handle first (works for most creators)
                 webbrowser.open(url)
                 return {"status": "success", "message": f"Attempted to open YouTube channel for '{query}' via direct handle URL. If it doesn't load, I'll search instead."}
@@ -590,79 +1261,55 @@ class AI_Core(QObject):
             if not application_name or not isinstance(application_name, str):
                 return {"status": "error", "message": "Invalid application name provided."}
             name_lower = application_name.lower().strip()
-            if sys.platform == "win32":
-                # Map friendly names to process names
-                process_map = {
-                    "chrome": ["chrome.exe"],
-                    "google chrome": ["chrome.exe"],
-                    "brave": ["brave.exe"],
-                    "brave browser": ["brave.exe"],
-                    "firefox": ["firefox.exe"],
-                    "edge": ["msedge.exe"],
-                    "microsoft edge": ["msedge.exe"],
-                    "discord": ["discord.exe"],
-                    "spotify": ["spotify.exe"],
-                    "steam": ["steam.exe"],
-                    "obs": ["obs64.exe"],
-                    "obs studio": ["obs64.exe"],
-                    "vlc": ["vlc.exe"],
-                    "notepad": ["notepad.exe"],
-                    "calculator": ["calculatorapp.exe", "calc.exe"],
-                    "explorer": ["explorer.exe"],
-                    "file explorer": ["explorer.exe"],
-                    "task manager": ["taskmgr.exe"],
-                    "cmd": ["cmd.exe"],
-                    "command prompt": ["cmd.exe"],
-                    "powershell": ["powershell.exe"],
-                    "teams": ["ms-teams.exe", "teams.exe"],
-                    "microsoft teams": ["ms-teams.exe", "teams.exe"],
-                    "outlook": ["outlook.exe"],
-                    "word": ["winword.exe"],
-                    "microsoft word": ["winword.exe"],
-                    "excel": ["excel.exe"],
-                    "microsoft excel": ["excel.exe"],
-                    "powerpoint": ["powerpnt.exe"],
-                    "zoom": ["zoom.exe"],
-                    "telegram": ["telegram.exe"],
-                    "skype": ["skype.exe"],
-                    "mumuplayer": ["MuMuNxMain.exe"],
-                    "mumu": ["MuMuNxMain.exe"],
-                    "mumu player": ["MuMuNxMain.exe"],
-                    "epic games": ["epicgameslauncher.exe"],
-                    "vs code": ["code.exe"],
-                    "vscode": ["code.exe"],
-                    "visual studio code": ["code.exe"],
-                    "paint": ["mspaint.exe"],
-                    "filmora": ["Filmora.exe"],
-                    "whatsapp": ["whatsapp.exe"],
-                }
-                processes = process_map.get(name_lower, [application_name if application_name.endswith(".exe") else application_name + ".exe"])
-                killed = []
-                for proc in processes:
-                    result = subprocess.run(f"taskkill /F /IM {proc}", shell=True, capture_output=True, text=True)
-                    if result.returncode == 0:
-                        killed.append(proc)
-                if killed:
-                    return {"status": "success", "message": f"Successfully closed '{application_name}'."}
-                else:
-                    # Try by window title as fallback
-                    result = subprocess.run(f'taskkill /F /FI "WINDOWTITLE eq *{application_name}*"', shell=True, capture_output=True, text=True)
-                    if result.returncode == 0:
-                        return {"status": "success", "message": f"Closed '{application_name}' by window title."}
-                    return {"status": "not_found", "message": f"'{application_name}' does not appear to be running."}
-            elif sys.platform == "darwin":
-                result = subprocess.run(["pkill", "-x", application_name], capture_output=True)
-                if result.returncode == 0:
-                    return {"status": "success", "message": f"Closed '{application_name}'."}
-                return {"status": "not_found", "message": f"'{application_name}' does not appear to be running."}
-            else:
-                result = subprocess.run(["pkill", application_name], capture_output=True)
-                if result.returncode == 0:
-                    return {"status": "success", "message": f"Closed '{application_name}'."}
-                return {"status": "not_found", "message": f"'{application_name}' does not appear to be running."}
+            return self._close_app_impl(application_name, name_lower)
         except Exception as e:
             return {"status": "error", "message": f"Failed to close '{application_name}': {str(e)}"}
 
+    def _close_app_win32(self, application_name, name_lower):
+        """Kills the app's processes with taskkill, falling back to a window-title match."""
+        processes = _resolve_win_processes(name_lower) or (application_name if application_name.endswith(".exe") else application_name + ".exe",)
+        if self._kill_processes_win32(processes):
+            return {"status": "success", "message": f"Successfully closed '{application_name}'."}
+        else:
+            # Try by window title as fallback
+            result = subprocess.run(["taskkill", "/F", "/FI", f"WINDOWTITLE eq *{application_name}*"], capture_output=True, text=True)
+            if result.returncode == 0:
+                return {"status": "success", "message": f"Closed '{application_name}' by window title."}
+            return {"status": "not_found", "message": f"'{application_name}' does not appear to be running."}
+
+    @staticmethod
+    def _kill_processes_win32(processes):
+        """Force-kills every process with one of the given image names; True if any was running."""
+        if psutil:
+            # TerminateProcess straight from this process, no taskkill child to spawn
+            names, killed = {p.lower() for p in processes}, False
+            for proc in psutil.process_iter(["name"]):
+                try:
+                    if (proc.info["name"] or "").lower() in names:
+                        proc.kill(); killed = True
+                except (psutil.NoSuchProcess, psutil.AccessDenied): pass
+            return killed
+        # One taskkill for every image name. It exits 128 if any name wasn't running, even when others were
+        # killed; the (localized) success lines go to stdout and the errors to stderr, so any stdout means a kill
+        cmd = ["taskkill", "/F"]
+        for proc in processes: cmd += ("/IM", proc)
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        return result.returncode == 0 or bool(result.stdout.strip())
+
+    def _close_app_darwin(self, application_name, name_lower):
+        """Kills processes whose name matches exactly."""
+        result = subprocess.run(["pkill", "-x", application_name], capture_output=True)
+        if result.returncode == 0:
+            return {"status": "success", "message": f"Closed '{application_name}'."}
+        return {"status": "not_found", "message": f"'{application_name}' does not appear to be running."}
+
+    def _close_app_linux(self, application_name, name_lower):
+        """Kills processes whose name matches the app name."""
+        result = subprocess.run(["pkill", application_name], capture_output=True)
+        if result.returncode == 0:
+            return {"status": "success", "message": f"Closed '{application_name}'."}
+        return {"status": "not_found", "message": f"'{application_name}' does not appear to be running."}
+
     def _open_website(self, url):
         print(f">>> [DEBUG] Attempting to open URL: '{url}'")
         try:
@@ -682,38 +1329,121 @@ class AI_Core(QObject):
                 self.latest_frame = None
             self.video_mode_changed.emit(mode)
 
+    def _open_camera(self):
+        """Opens the default webcam as low-resolution MJPEG and works out how many frames to skip."""
+        capture = cv2.VideoCapture(0)
+        capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+        capture.set(cv2.CAP_PROP_FPS, PREVIEW_FPS)
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1) # Don't let the driver queue up stale frames
+        source_fps = capture.get(cv2.CAP_PROP_FPS) or PREVIEW_FPS
+        self.camera_frame_skip = max(0, round(source_fps / PREVIEW_FPS) - 1)
+        return capture
+
+    def _read_camera_frame(self, capture):
+        """Grabs past the frames we don't need without decoding them, then decodes one into a frame slot."""
+        for _ in range(self.camera_frame_skip):
+            capture.grab()
+        if not capture.grab():
+            return False, None
+        slot = self._next_frame_slot()
+        ret, frame = capture.retrieve(slot)
+        if ret and frame is not slot: # First frame or a resolution change: size the slots to match
+            # Five: the latest frame, the GUI, the preview and the encoder can each hold one and one stays free
+            self._frame_slots = [np.empty_like(frame) for _ in range(5)]
+        return ret, frame
+
+    def _grab_screen(self):
+        """Captures the primary monitor as a BGRA ndarray that views mss's buffer (no conversion pass)."""
+        sct = getattr(self._screen_local, "sct", None)
+        if sct is None: # mss handles are tied to the thread that opened them
+            sct = self._screen_local.sct = mss.mss()
+        return np.asarray(sct.grab(sct.monitors[1]))
+
+    def _next_frame_slot(self):
+        """Round-robins the capture buffers, skipping the ones the GUI and the Gemini encoder still hold."""
+        if self._frame_slots is None: return None
+        n = len(self._frame_slots)
+        with self._slot_lock:
+            # Starting after _slot_idx and never wrapping back to it keeps the previous capture, which is
+            # latest_frame until this one lands, out of the pick as well
+            idx = (self._slot_idx + 1) % n
+            while idx in (self._pending_slot, self._shown_slot, self._encoding_slot): idx = (idx + 1) % n
+            self._slot_idx = idx
+        return self._frame_slots[idx]
+
+    @staticmethod
+    def _frame_to_qimage(frame):
+        # No copy: the QImage keeps the array alive, and a slot handed to the GUI stays reserved (_pending_slot,
+        # then _shown_slot) under _slot_lock until the next frame replaces it, so capture never writes into it
+        h, w, ch = frame.shape
+        if frame.strides[1:] != (ch, 1) or frame.strides[0] < w * ch: # Pixels not packed (e.g. a channel slice)
+            frame = np.ascontiguousarray(frame)
+        stride = frame.strides[0]
+        if stride != w * ch: # Padded rows: hand Qt one flat run of bytes and let it step by the real row stride
+            frame = np.lib.stride_tricks.as_strided(frame, shape=((h - 1) * stride + w * ch,), strides=(1,))
+        # Screen frames are BGRA, which is Qt's RGB32 byte order on little-endian machines
+        return QImage(frame.data, w, h, stride, QImage.Format_RGB32 if ch == 4 else QImage.Format_BGR888)
+
+    def _publish_frame(self, image):
+        with self._frame_lock: self._preview_image = image
+
+    def take_frame(self):
+        """Returns the newest preview frame and clears the slot, or None if nothing new arrived."""
+        with self._frame_lock:
+            image, self._preview_image = self._preview_image, None
+        return image
+
+    def frame_consumed(self):
+        """Called by the GUI once it has taken a frame, allowing the next one to be sent."""
+        # The painted slot moves from pending to shown in one locked step, so it is never unguarded
+        with self._slot_lock: self._shown_slot, self._pending_slot = self._pending_slot, None
+        self._frame_pending = False # Plain flag, read by the backend; a single store is atomic under the GIL
+
     async def stream_video_to_gui(self):
         video_capture = None
+        frame_interval = 1 / PREVIEW_FPS
+        next_t = self.loop.time()
         while self.is_running:
             frame = None
+            camera_paced = False
             try:
                 if self.video_mode == "camera":
-                    if video_capture is None: video_capture = await asyncio.to_thread(cv2.VideoCapture, 0)
+                    if video_capture is None: video_capture = await asyncio.to_thread(self._open_camera)
                     if video_capture.isOpened():
-                        ret, frame = await asyncio.to_thread(video_capture.read)
+                        ret, frame = await asyncio.to_thread(self._read_camera_frame, video_capture)
                         if not ret:
                             await asyncio.sleep(0.01)
                             continue
+                        camera_paced = True # grab() already blocked until the driver delivered this frame
                 elif self.video_mode == "screen":
                     if video_capture is not None:
                         await asyncio.to_thread(video_capture.release)
                         video_capture = None
-                    screenshot = await asyncio.to_thread(ImageGrab.grab)
-                    frame = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+                    frame = await asyncio.to_thread(self._grab_screen)
                 else:
                     if video_capture is not None:
                         await asyncio.to_thread(video_capture.release)
                         video_capture = None
                     await asyncio.sleep(0.1)
                     continue
-                if frame is not None:
-                    self.latest_frame = frame
-                    h, w, ch = frame.shape
-                    bytes_per_line = ch * w
-                    qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format_BGR888)
-                    self.frame_received.emit(qt_image.copy())
-                else: self.frame_received.emit(QImage())
-                await asyncio.sleep(0.033)
+                if frame is not None: self.latest_frame = frame
+                # Only build a QImage once the GUI has shown the previous one; otherwise it would be dropped unseen
+                if not self._frame_pending:
+                    self._frame_pending = True
+                    if frame is not None:
+                        slots = self._frame_slots
+                        with self._slot_lock:
+                            self._pending_slot = self._slot_idx if slots is not None and frame is slots[self._slot_idx] else None
+                        self._publish_frame(await asyncio.to_thread(self._frame_to_qimage, frame))
+                    else: self._publish_frame(QImage())
+                # Sleep to an absolute deadline so capture time isn't added on top of the frame interval
+                now = self.loop.time()
+                if camera_paced: next_t = now
+                else:
+                    next_t = max(next_t + frame_interval, now)
+                    await asyncio.sleep(next_t - now)
             except Exception as e:
                 print(f">>> [ERROR] Video streaming error: {e}")
                 if video_capture is not None:
@@ -723,21 +1453,208 @@ class AI_Core(QObject):
         if video_capture is not None: await asyncio.to_thread(video_capture.release)
 
     async def send_frames_to_gemini(self):
+        # Sample on a fixed 3 s cadence; the encode runs on its own thread so it never delays the next sample
+        next_t, pending = self.loop.time(), None
         while self.is_running:
-            await asyncio.sleep(3.0)
-            if self.video_mode != "none" and self.latest_frame is not None:
-                frame_rgb = cv2.cvtColor(self.latest_frame, cv2.COLOR_BGR2RGB)
-                pil_img = PIL.Image.fromarray(frame_rgb)
-                pil_img.thumbnail([1024, 1024])
-                image_io = io.BytesIO()
-                pil_img.save(image_io, format="jpeg")
-                gemini_data = {"mime_type": "image/jpeg", "data": base64.b64encode(image_io.getvalue()).decode()}
-                await self.out_queue_gemini.put(gemini_data)
+            next_t += 3.0
+            await asyncio.sleep(max(0.0, next_t - self.loop.time()))
+            if self.video_mode == "none" or self.latest_frame is None: continue
+            if pending is not None and not pending.done(): continue # Previous encode still running: skip this sample
+            with self._slot_lock: # Snapshot and reserve together, so a capture can't pick the slot in between
+                frame, slots = self.latest_frame, self._frame_slots
+                self._encoding_slot = next((i for i, slot in enumerate(slots) if slot is frame), None) if slots else None
+            pending = self.loop.run_in_executor(self._encode_pool, self._encode_frame_for_gemini, frame)
+            pending.add_done_callback(self._on_frame_encoded)
+
+    def _on_frame_encoded(self, future):
+        """Runs on the event loop when an encode finishes; hands the frame to send_realtime."""
+        with self._slot_lock: self._encoding_slot = None
+        if future.cancelled(): return
+        if future.exception() is not None:
+            print(f">>> [ERROR] Frame encode failed: {future.exception()}"); return
+        gemini_data = future.result()
+        if gemini_data and self._queued_image is not None:
+            self._queued_image.update(gemini_data) # Previous frame not sent yet: latest frame wins
+        elif gemini_data:
+            self._queued_image = gemini_data
+            self._enqueue_for_gemini(gemini_data)
+
+    def _encode_frame_for_gemini(self, frame):
+        """Shrinks a BGR frame to fit GEMINI_FRAME_MAX_SIDE and returns it as a raw JPEG message."""
+        h, w = frame.shape[:2]
+        scale = GEMINI_FRAME_MAX_SIDE / max(h, w)
+        if scale < 1: # Same fit-in-box as PIL's thumbnail(), never upscales
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            if self.gemini_frame_small is None or self.gemini_frame_small.shape != (size[1], size[0]) + frame.shape[2:]:
+                self.gemini_frame_small = np.empty((size[1], size[0]) + frame.shape[2:], dtype=frame.dtype)
+            frame = cv2.resize(frame, size, dst=self.gemini_frame_small, interpolation=cv2.INTER_AREA)
+        if frame.shape[2:] == (4,): frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR) # JPEG has no alpha; convert after shrinking
+        ok, encoded = cv2.imencode(".jpg", frame, GEMINI_JPEG_PARAMS)
+        if not ok: return None
+        return {"mime_type": "image/jpeg", "data": encoded.tobytes()} # Blob takes bytes; no base64 round trip
+
+    # --- Tool call handlers: run in a worker thread by receive_text, so they may block ---
+    def _log_activity(self, tag, html_body):
+        """Collects an activity block; receive_text emits a tool-call chunk's blocks as one batch."""
+        self._activity_batch.append((tag, html_body))
+
+    def _flush_activity(self):
+        if self._activity_batch:
+            self.tool_activity_batch_received.emit(self._activity_batch)
+            self._activity_batch = []
+
+    def _log_progress(self, tag, html_body):
+        """Shows an in-progress block right away, so it is timestamped before the slow call it announces."""
+        self._flush_activity() # Earlier blocks keep their order
+        self.tool_activity_received.emit(tag, html_body)
+
+    def _tool_create_folder(self, args):
+        path = args.get("folder_path", "")
+        result = self._create_folder(folder_path=path)
+        ok = result.get("status") == "success"
+        self._log_activity("📁 CREATE FOLDER", _TOOL_TEMPLATES["create_folder"].format_map({
+            "color": "#90EE90" if ok else "#ff9944", "icon": "📁" if ok else "⚠",
+            "path": escape(path), "message": escape(result.get("message", ""))}))
+        return result
+
+    def _tool_create_file(self, args):
+        path = args.get("file_path", "")
+        content = args.get("content", "")
+        result = self._create_file(file_path=path, content=content)
+        ok = result.get("status") == "success"
+        self._log_activity("📄 CREATE FILE", _TOOL_TEMPLATES["create_file"].format_map({
+            "color": "#90EE90" if ok else "#ff9944", "path": escape(path),
+            "lines": len(content.splitlines()),
+            "message": escape(result.get("message", ""))}))
+        return result
+
+    def _tool_edit_file(self, args):
+        path = args.get("file_path", "")
+        result = self._edit_file(file_path=path, content=args.get("content", ""))
+        ok = result.get("status") == "success"
+        self._log_activity("✏ EDIT FILE", _TOOL_TEMPLATES["edit_file"].format_map({
+            "color": "#90EE90" if ok else "#ff9944", "path": escape(path),
+            "message": escape(result.get("message", ""))}))
+        return result
+
+    def _tool_list_files(self, args):
+        return self._list_files(directory_path=args.get("directory_path"))
+
+    def _tool_read_file(self, args):
+        path = args.get("file_path", "")
+        result = self._read_file(file_path=path)
+        ok = result.get("status") == "success"
+        content = result.get("content", "")
+        preview = content[:120].replace("\n", " ") if ok else result.get("message", "")
+        self._log_activity("📖 READ FILE", _TOOL_TEMPLATES["read_file"].format_map({
+            "color": "#90EE90" if ok else "#ff9944", "path": escape(path),
+            "preview": escape(preview), "more": "..." if len(content) > 120 else ""}))
+        return result
+
+    def _tool_open_application(self, args):
+        app = args.get("application_name", "")
+        esc_app = escape(app)
+        self._log_progress("🚀 LAUNCHING APP", _TOOL_TEMPLATES["app_launching"].format_map({"app": esc_app}))
+        result = self._open_application(application_name=app)
+        ok = result.get("status") == "success"
+        self._log_activity("🚀 APP LAUNCHED", _TOOL_TEMPLATES["app_launched"].format_map({
+            "color": "#90EE90" if ok else "#ff9944", "icon": "✔" if ok else "✘",
+            "app": esc_app, "message": escape(result.get("message", ""))}))
+        return result
+
+    def _tool_close_application(self, args):
+        app = args.get("application_name", "")
+        esc_app = escape(app)
+        self._log_progress("⏹ CLOSING APP", _TOOL_TEMPLATES["app_closing"].format_map({"app": esc_app}))
+        result = self._close_application(application_name=app)
+        ok = result.get("status") == "success"
+        self._log_activity("⏹ APP CLOSED", _TOOL_TEMPLATES["app_closed"].format_map({
+            "color": "#90EE90" if ok else "#ff6b6b", "icon": "✔" if ok else "✘",
+            "app": esc_app, "message": escape(result.get("message", ""))}))
+        return result
+
+    def _tool_open_website(self, args):
+        url = args.get("url", "")
+        result = self._open_website(url=url)
+        ok = result.get("status") == "success"
+        display = url.split("//")[-1].split("/")[0] if "//" in url else url
+        self._log_activity("🌐 OPEN WEBSITE", _TOOL_TEMPLATES["open_website"].format_map({
+            "color": "#90EE90" if ok else "#ff9944", "url": escape(url), "display": escape(display),
+            "message": escape(result.get("message", ""))}))
+        return result
+
+    def _tool_open_direct_youtube(self, args):
+        query = args.get("query", "")
+        ctype = args.get("content_type", "channel")
+        result = self._open_direct_youtube(query=query, content_type=ctype)
+        self._log_activity("▶ YOUTUBE SEARCH", _TOOL_TEMPLATES["open_direct_youtube"].format_map({
+            "query": escape(query), "ctype": ctype}))
+        return result
+
+    def _tool_search_and_open(self, args):
+        query = args.get("query", "")
+        platform = args.get("platform", "youtube")
+        result = self._search_and_open(query=query, platform=platform)
+        self._log_activity("🔍 SEARCH & OPEN", _TOOL_TEMPLATES["search_and_open"].format_map({
+            "plat_color": "#ff4444" if platform == "youtube" else "#4488ff",
+            "platform": escape(platform.upper()), "query": escape(query)}))
+        return result
+
+    def _tool_search_file(self, args):
+        filename = args.get("filename", "")
+        print(f">>> [DEBUG] Searching for file: {filename}")
+        self._log_progress("🔍 FILE SEARCH", _TOOL_TEMPLATES["search_file"].format_map({"filename": escape(filename)}))
+        matches = self._search_file_sync(filename)
+        if matches:
+            result = {"status": "success", "message": f"Found {len(matches)} match(es).", "matches": matches, "best_match": matches[0]}
+        else:
+            result = {"status": "not_found", "message": f"No file matching '{filename}' found."}
+        self._flush_activity() # Keep the log ahead of the search results it introduces
+        self.file_search_received.emit(filename, matches)
+        return result
+
+    def _tool_open_file(self, args):
+        file_path = args.get("file_path")
+        filename = args.get("filename")
+        if not file_path and filename:
+            self._log_progress("🔍 LOCATING FILE", _TOOL_TEMPLATES["locating_file"].format_map({"filename": escape(filename)}))
+            matches = self._search_file_sync(filename)
+            file_path = matches[0] if matches else None
+            if matches:
+                self._flush_activity()
+                self.file_search_received.emit(filename, matches)
+        # startfile reports a missing file itself; open/xdg-open only fail later in the child, so stat first there
+        if file_path and (sys.platform == "win32" or os.path.exists(file_path)):
+            result = self._open_file(file_path)
+        else:
+            result = {"status": "not_found", "message": f"File not found: '{file_path or filename}'."}
+        if result.get("status") == "success":
+            self._flush_activity()
+            self.file_opened_received.emit(file_path)
+        elif result.get("status") != "not_found":
+            self._log_activity("⚠ OPEN FAILED", _TOOL_TEMPLATES["open_failed"].format_map({"message": escape(result.get("message", ""))}))
+        else:
+            self._log_activity("⚠ FILE NOT FOUND", _TOOL_TEMPLATES["file_not_found"].format_map({"filename": escape(filename or file_path or "?")}))
+        return result
+
+    def _tool_move_file(self, args):
+        src = args.get("source_path", "")
+        dst = args.get("destination_path", "")
+        esc_name = escape(os.path.basename(src))
+        self._log_progress("📦 MOVING FILE", _TOOL_TEMPLATES["moving_file"].format_map({
+            "name": esc_name, "src": escape(src), "dst": escape(dst)}))
+        result = self._move_file(source_path=src, destination_path=dst)
+        ok = result.get("status") == "success"
+        self._log_activity("📦 FILE MOVED", _TOOL_TEMPLATES["file_moved"].format_map({
+            "color": "#90EE90" if ok else "#ff6b6b", "icon": "✔" if ok else "✘",
+            "name": esc_name, "dst": escape(result.get("destination", dst))}))
+        return result
 
     async def receive_text(self):
         while self.is_running:
             try:
                 turn_urls, turn_code_content, turn_code_result, file_list_data = set(), "", "", None
+                turn_speaking = False # speaking_started goes out once per turn, not once per audio chunk
                 turn = self.session.receive()
                 async for chunk in turn:
                     if chunk.tool_call and chunk.tool_call.function_calls:
@@ -746,161 +1663,15 @@ class AI_Core(QObject):
                             args, result = fc.args, {}
                             print(f">>> [DEBUG] Tool call: {fc.name} args={args}")
 
-                            if fc.name == "create_folder":
-                                path = args.get("folder_path", "")
-                                result = self._create_folder(folder_path=path)
-                                ok = result.get("status") == "success"
-                                icon = "📁" if ok else "⚠"
-                                color = "#90EE90" if ok else "#ff9944"
-                                self.tool_activity_received.emit("📁 CREATE FOLDER",
-                                    f'<p style="color:{color};">{icon} <span style="color:#87CEEB;">{escape(path)}</span><br>'
-                                    f'<span style="color:#888; font-size:9pt;">{escape(result.get("message",""))}</span></p>')
-
-                            elif fc.name == "create_file":
-                                path = args.get("file_path", "")
-                                result = self._create_file(file_path=path, content=args.get("content", ""))
-                                ok = result.get("status") == "success"
-                                lines = len(args.get("content","").splitlines())
-                                color = "#90EE90" if ok else "#ff9944"
-                                self.tool_activity_received.emit("📄 CREATE FILE",
-                                    f'<p style="color:{color};">📄 <span style="color:#87CEEB;">{escape(path)}</span><br>'
-                                    f'<span style="color:#888; font-size:9pt;">{lines} line(s) written &mdash; {escape(result.get("message",""))}</span></p>')
-
-                            elif fc.name == "edit_file":
-                                path = args.get("file_path", "")
-                                result = self._edit_file(file_path=path, content=args.get("content", ""))
-                                ok = result.get("status") == "success"
-                                color = "#90EE90" if ok else "#ff9944"
-                                self.tool_activity_received.emit("✏ EDIT FILE",
-                                    f'<p style="color:{color};">✏ <span style="color:#87CEEB;">{escape(path)}</span><br>'
-                                    f'<span style="color:#888; font-size:9pt;">{escape(result.get("message",""))}</span></p>')
-
-                            elif fc.name == "list_files":
-                                result = self._list_files(directory_path=args.get("directory_path"))
-                                if result.get("status") == "success":
-                                    file_list_data = (result.get("directory_path"), result.get("files"))
-
-                            elif fc.name == "read_file":
-                                path = args.get("file_path", "")
-                                result = self._read_file(file_path=path)
-                                ok = result.get("status") == "success"
-                                color = "#90EE90" if ok else "#ff9944"
-                                preview = result.get("content", "")[:120].replace("\n", " ") if ok else result.get("message", "")
-                                self.tool_activity_received.emit("📖 READ FILE",
-                                    f'<p>📖 <span style="color:#87CEEB;">{escape(path)}</span></p>'
-                                    f'<p style="color:{color}; font-size:9pt; font-style:italic;">{escape(preview)}{"..." if len(result.get("content","")) > 120 else ""}</p>')
-
-                            elif fc.name == "open_application":
-                                app = args.get("application_name", "")
-                                self.tool_activity_received.emit("🚀 LAUNCHING APP",
-                                    f'<p>🚀 <span style="color:#00ffff; font-weight:bold;">{escape(app)}</span>'
-                                    f'<span style="color:#888;"> &mdash; initializing...</span></p>')
-                                result = self._open_application(application_name=app)
-                                ok = result.get("status") == "success"
-                                color = "#90EE90" if ok else "#ff9944"
-                                icon = "✔" if ok else "✘"
-                                self.tool_activity_received.emit("🚀 APP LAUNCHED",
-                                    f'<p style="color:{color};">{icon} <span style="color:#00ffff;">{escape(app)}</span> &mdash; {escape(result.get("message",""))}</p>')
-
-                            elif fc.name == "close_application":
-                                app = args.get("application_name", "")
-                                self.tool_activity_received.emit("⏹ CLOSING APP",
-                                    f'<p>⏹ Terminating <span style="color:#ff9944; font-weight:bold;">{escape(app)}</span>...</p>')
-                                result = self._close_application(application_name=app)
-                                ok = result.get("status") == "success"
-                                color = "#90EE90" if ok else "#ff6b6b"
-                                icon = "✔" if ok else "✘"
-                                self.tool_activity_received.emit("⏹ APP CLOSED",
-                                    f'<p style="color:{color};">{icon} <span style="color:#ff9944;">{escape(app)}</span> &mdash; {escape(result.get("message",""))}</p>')
-
-                            elif fc.name == "open_website":
-                                url = args.get("url", "")
-                                result = self._open_website(url=url)
-                                ok = result.get("status") == "success"
-                                display = url.split("//")[-1].split("/")[0] if "//" in url else url
-                                color = "#90EE90" if ok else "#ff9944"
-                                self.tool_activity_received.emit("🌐 OPEN WEBSITE",
-                                    f'<p>🌐 <a href="{escape(url)}" style="color:#00ffff; text-decoration:none;">{escape(display)}</a></p>'
-                                    f'<p style="color:{color}; font-size:9pt;">{escape(result.get("message",""))}</p>')
-
-                            elif fc.name == "open_direct_youtube":
-                                query = args.get("query", "")
-                                ctype = args.get("content_type", "channel")
-                                result = self._open_direct_youtube(query=query, content_type=ctype)
-                                self.tool_activity_received.emit("▶ YOUTUBE SEARCH",
-                                    f'<p>▶ <span style="color:#ff4444;">You</span><span style="color:#ffffff;">Tube</span>'
-                                    f' &mdash; <span style="color:#00ffff;">{escape(query)}</span>'
-                                    f' <span style="color:#888; font-size:9pt;">({ctype})</span></p>')
-
-                            elif fc.name == "search_and_open":
-                                query = args.get("query", "")
-                                platform = args.get("platform", "youtube")
-                                result = self._search_and_open(query=query, platform=platform)
-                                plat_color = "#ff4444" if platform == "youtube" else "#4488ff"
-                                self.tool_activity_received.emit("🔍 SEARCH & OPEN",
-                                    f'<p>🔍 <span style="color:{plat_color}; font-weight:bold;">{escape(platform.upper())}</span>'
-                                    f' &rarr; <span style="color:#00ffff;">{escape(query)}</span></p>'
-                                    f'<p style="color:#90EE90; font-size:9pt;">Opening best match...</p>')
-
-                            elif fc.name == "search_file":
-                                filename = args.get("filename", "")
-                                print(f">>> [DEBUG] Searching for file: {filename}")
-                                self.tool_activity_received.emit("🔍 FILE SEARCH",
-                                    f'<p>🔍 Scanning directories for <span style="color:#00ffff;">{escape(filename)}</span>...'
-                                    f'<br><span style="color:#888; font-size:9pt;">Desktop · Downloads · Documents · Videos · Music · Pictures</span></p>')
-                                matches = await asyncio.to_thread(self._search_file_sync, filename)
-                                if matches:
-                                    result = {"status": "success", "message": f"Found {len(matches)} match(es).", "matches": matches, "best_match": matches[0]}
-                                else:
-                                    result = {"status": "not_found", "message": f"No file matching '{filename}' found."}
-                                self.file_search_received.emit(filename, matches)
-
-                            elif fc.name == "open_file":
-                                file_path = args.get("file_path")
-                                filename = args.get("filename")
-                                if not file_path and filename:
-                                    self.tool_activity_received.emit("🔍 LOCATING FILE",
-                                        f'<p>🔍 Locating <span style="color:#00ffff;">{escape(filename)}</span>...'
-                                        f'<br><span style="color:#888; font-size:9pt;">Scanning common folders...</span></p>')
-                                    matches = await asyncio.to_thread(self._search_file_sync, filename)
-                                    file_path = matches[0] if matches else None
-                                    if matches:
-                                        self.file_search_received.emit(filename, matches)
-                                if file_path and os.path.exists(file_path):
-                                    try:
-                                        if sys.platform == "win32":
-                                            os.startfile(file_path)
-                                        else:
-                                            subprocess.Popen(["xdg-open", file_path])
-                                        result = {"status": "success", "message": f"Opened '{os.path.basename(file_path)}' successfully."}
-                                        self.file_opened_received.emit(file_path)
-                                    except Exception as e:
-                                        result = {"status": "error", "message": f"Failed to open file: {str(e)}"}
-                                        self.tool_activity_received.emit("⚠ OPEN FAILED",
-                                            f'<p style="color:#ff6b6b;">⚠ {escape(str(e))}</p>')
-                                else:
-                                    result = {"status": "not_found", "message": f"File not found: '{file_path or filename}'."}
-                                    self.tool_activity_received.emit("⚠ FILE NOT FOUND",
-                                        f'<p style="color:#ff6b6b;">⚠ Could not locate <span style="color:#00ffff;">{escape(filename or file_path or "?")}</span></p>')
-
-                            elif fc.name == "move_file":
-                                src = args.get("source_path", "")
-                                dst = args.get("destination_path", "")
-                                src_name = os.path.basename(src)
-                                self.tool_activity_received.emit("📦 MOVING FILE",
-                                    f'<p>📦 <span style="color:#00ffff;">{escape(src_name)}</span>'
-                                    f'<br><span style="color:#888; font-size:9pt;">'
-                                    f'{escape(src)}<br>&#8595; {escape(dst)}</span></p>')
-                                result = self._move_file(source_path=src, destination_path=dst)
-                                ok = result.get("status") == "success"
-                                color = "#90EE90" if ok else "#ff6b6b"
-                                icon = "✔" if ok else "✘"
-                                dest_final = result.get("destination", dst)
-                                self.tool_activity_received.emit("📦 FILE MOVED",
-                                    f'<p style="color:{color};">{icon} <span style="color:#00ffff;">{escape(src_name)}</span>'
-                                    f'<br><span style="color:#888; font-size:9pt;">&#8594; {escape(dest_final)}</span></p>')
-
-                            function_responses.append({"id": fc.id, "name": fc.name, "response": result})
+                            handler = self._tool_dispatch.get(fc.name)
+                            if handler: result = await asyncio.to_thread(handler, args)
+                            if fc.name == "list_files" and result.get("status") == "success":
+                                # (name, is_dir) pairs are for the GUI only; the model just gets the names
+                                file_list_data = (result.get("directory_path"), result.pop("entries"))
+
+                            function_responses.append(types.FunctionResponse(id=fc.id, name=fc.name, response=result))
+                        self._flush_activity() # One GUI update for the whole batch of calls
+                        # Sent per tool-call chunk: the model waits on these before it continues (or ends) the turn
                         await self.session.send_tool_response(function_responses=function_responses)
                         continue
                     if chunk.server_content:
@@ -912,40 +1683,113 @@ class AI_Core(QObject):
                                 if hasattr(part, 'executable_code') and part.executable_code: turn_code_content = part.executable_code.code
                                 if hasattr(part, 'code_execution_result') and part.code_execution_result: turn_code_result = part.code_execution_result.output
                                 if hasattr(part, 'inline_data') and part.inline_data:
-                                    await self.audio_in_queue_player.put(part.inline_data.data)
-                                    self.speaking_started.emit()
+                                    self._queue_playback(part.inline_data.data)
+                                    if not turn_speaking:
+                                        turn_speaking = True
+                                        self.speaking_started.emit()
                                 if hasattr(part, 'text') and part.text:
-                                    self.text_received.emit(part.text)
+                                    self._queue_text(part.text)
                 if file_list_data: self.file_list_received.emit(file_list_data[0], file_list_data[1])
                 elif turn_code_content: self.code_being_executed.emit(turn_code_content, turn_code_result)
                 elif turn_urls: self.search_results_received.emit(list(turn_urls))
-                else:
-                    self.code_being_executed.emit("", ""); self.search_results_received.emit([]); self.file_list_received.emit("", [])
+                self._flush_text() # The turn's last words must land before the newline
                 self.end_of_turn.emit()
                 self.speaking_stopped.emit()
             except Exception:
                 if not self.is_running: break
                 traceback.print_exc()
 
+    def _queue_text(self, text):
+        """Buffers a streamed text fragment; fragments arriving within TEXT_FLUSH_DELAY go out as one signal."""
+        self._text_buf.append(text)
+        if self._text_flush_handle is None:
+            self._text_flush_handle = self.loop.call_later(TEXT_FLUSH_DELAY, self._flush_text)
+
+    def _flush_text(self):
+        if self._text_flush_handle is not None:
+            self._text_flush_handle.cancel()
+            self._text_flush_handle = None
+        if self._text_buf:
+            payload = "".join(self._text_buf)
+            self._text_buf.clear()
+            self.text_received.emit(payload)
+
+    def _on_mic_audio(self, in_data, frame_count, time_info, status):
+        """PortAudio callback (audio thread): copies the buffer into the ring and wakes listen_audio."""
+        if not self.is_running: return (None, pyaudio.paComplete)
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        ring, start = self._mic_ring, self._mic_written % len(self._mic_ring)
+        first = min(len(samples), len(ring) - start)
+        ring[start:start + first] = samples[:first]
+        ring[:len(samples) - first] = samples[first:]
+        self._mic_written += len(samples) # Published last, so the reader never sees a half-written chunk
+        # A wake-up already pending will see this chunk too (the reader clears before reading the count)
+        if not self._mic_ready.is_set() and not self.loop.is_closed(): self.loop.call_soon_threadsafe(self._mic_ready.set)
+        return (None, pyaudio.paContinue)
+
     async def listen_audio(self):
+        self._mic_ring = np.zeros(CHUNK_SIZE * MIC_RING_CHUNKS, dtype=np.int16)
+        self._mic_wrap = np.empty(CHUNK_SIZE, dtype=np.int16) # Scratch for chunks that straddle the ring end
+        self._mic_written, self._mic_ready = 0, asyncio.Event()
         mic_info = pya.get_default_input_device_info()
-        self.audio_stream = pya.open(format=FORMAT, channels=CHANNELS, rate=SEND_SAMPLE_RATE, input=True, input_device_index=mic_info["index"], frames_per_buffer=CHUNK_SIZE)
+        self.audio_stream = pya.open(format=FORMAT, channels=CHANNELS, rate=SEND_SAMPLE_RATE, input=True, input_device_index=mic_info["index"],
+                                     frames_per_buffer=CHUNK_SIZE, stream_callback=self._on_mic_audio)
+        ring, read_pos = self._mic_ring, 0
         while self.is_running:
-            data = await asyncio.to_thread(self.audio_stream.read, CHUNK_SIZE, exception_on_overflow=False)
-            if not self.is_running: break
-            await self.out_queue_gemini.put({"data": data, "mime_type": "audio/pcm"})
+            await self._mic_ready.wait()
+            self._mic_ready.clear()
+            written = self._mic_written
+            if written - read_pos > len(ring): read_pos = written - len(ring) # Fell a full ring behind, drop the oldest audio
+            while self.is_running and written - read_pos >= CHUNK_SIZE:
+                start = read_pos % len(ring)
+                if start + CHUNK_SIZE <= len(ring): data = ring[start:start + CHUNK_SIZE].tobytes()
+                else: data = np.concatenate((ring[start:], ring[:start + CHUNK_SIZE - len(ring)]), out=self._mic_wrap).tobytes()
+                read_pos += CHUNK_SIZE
+                self._enqueue_for_gemini({"data": data, "mime_type": "audio/pcm"})
+
+    def _enqueue_for_gemini(self, msg):
+        """Hands a message to send_realtime without waiting; drops it if the uplink is backed up."""
+        try:
+            self.out_queue_gemini.put_nowait(msg)
+        except asyncio.QueueFull:
+            self.gemini_dropped += 1
+            if self.gemini_dropped % 100 == 1:
+                print(f">>> [WARN] Gemini send queue full, dropped {self.gemini_dropped} message(s) so far.")
+            if msg is self._queued_image: self._queued_image = None
+
+    def _queue_playback(self, data):
+        """Queues reply audio for play_audio, which moves it into the speaker buffer."""
+        self.audio_in_queue_player.put_nowait(data)
+
+    def _clear_playback(self):
+        """Drops reply audio that hasn't reached the speaker yet."""
+        with self._play_lock:
+            self._play_buf.clear()
+            self._play_offset = 0
 
     async def send_realtime(self):
         while self.is_running:
             msg = await self.out_queue_gemini.get()
             if not self.is_running: break
             if isinstance(msg, dict) and msg.get("mime_type") == "audio/pcm":
+                # Coalesce the audio already queued behind this chunk into a single frame
+                chunks, size = [msg["data"]], len(msg["data"])
+                msg = None
+                while size < REALTIME_AUDIO_BATCH_BYTES and not self.out_queue_gemini.empty():
+                    queued = self.out_queue_gemini.get_nowait()
+                    self.out_queue_gemini.task_done()
+                    if isinstance(queued, dict) and queued.get("mime_type") == "audio/pcm":
+                        chunks.append(queued["data"]); size += len(queued["data"])
+                    else:
+                        msg = queued # Send it right after the audio to keep ordering
+                        break
                 await self.session.send_realtime_input(
-                    audio=types.Blob(data=msg["data"], mime_type="audio/pcm")
+                    audio=types.Blob(data=b"".join(chunks), mime_type="audio/pcm")
                 )
-            elif isinstance(msg, dict) and msg.get("mime_type") == "image/jpeg":
+            if msg is self._queued_image: self._queued_image = None # Taken off the queue; the next frame queues afresh
+            if isinstance(msg, dict) and msg.get("mime_type") == "image/jpeg":
                 await self.session.send_realtime_input(
-                    video=types.Blob(data=base64.b64decode(msg["data"]), mime_type="image/jpeg")
+                    video=types.Blob(data=msg["data"], mime_type="image/jpeg")
                 )
             self.out_queue_gemini.task_done()
 
@@ -955,52 +1799,90 @@ class AI_Core(QObject):
             if text is None:
                 self.text_input_queue.task_done(); break
             if self.session:
-                for q in [self.response_queue_tts, self.audio_in_queue_player]:
-                    while not q.empty(): q.get_nowait()
+                self.response_queue_tts.drain(); self.audio_in_queue_player.drain()
+                self._clear_playback()
                 await self.session.send_client_content(turns=[{"role": "user", "parts": [{"text": text or "."}]}])
             self.text_input_queue.task_done()
 
-    async def tts(self):
-        uri = f"wss://api.elevenlabs.io/v1/text-to-speech/{VOICE_TYPE}/stream-input?model_id=eleven_turbo_v2_5&output_format=pcm_24000"
-        while self.is_running:
-            text_chunk = await self.response_queue_tts.get()
-            if text_chunk is None or not self.is_running:
-                self.response_queue_tts.task_done(); continue
-            
-            self.speaking_started.emit()
+    async def _tts_connect(self, uri):
+        """Opens the ElevenLabs stream and starts a reader that feeds its audio to playback for the socket's lifetime."""
+        # Base64 PCM barely deflates, so skip compression; bigger frames and write buffer for bursts
+        websocket = await websockets.connect(uri, compression=None, max_size=2**22, write_limit=2**20,
+                                             ping_interval=10, ping_timeout=10)
+        await websocket.send(json_dumps({"text": " ", "voice_settings": {"stability": 0.5, "similarity_boost": 0.8}, "xi_api_key": ELEVENLABS_API_KEY,}))
+        async def listen():
             try:
-                async with websockets.connect(uri) as websocket:
-                    await websocket.send(json.dumps({"text": " ", "voice_settings": {"stability": 0.5, "similarity_boost": 0.8}, "xi_api_key": ELEVENLABS_API_KEY,}))
-                    async def listen():
-                        while self.is_running:
-                            try:
-                                message = await websocket.recv()
-                                data = json.loads(message)
-                                if data.get("audio"): await self.audio_in_queue_player.put(base64.b64decode(data["audio"]))
-                                elif data.get("isFinal"): break
-                            except websockets.exceptions.ConnectionClosed: break
-                    listen_task = asyncio.create_task(listen())
-                    await websocket.send(json.dumps({"text": text_chunk + " "}))
+                async for message in websocket:
+                    # Audio frames lead with the base64 payload; slice it out instead of tokenizing the whole frame
+                    if message.startswith('{"audio":"'):
+                        end = message.find('"', 10)
+                        if end > 10: self._queue_playback(base64.b64decode(message[10:end]))
+                        continue
+                    data = json_loads(message)
+                    if data.get("audio"): self._queue_playback(base64.b64decode(data["audio"]))
+            except websockets.exceptions.ConnectionClosed: pass
+        return websocket, asyncio.create_task(listen())
+
+    async def tts(self):
+        # inactivity_timeout keeps the socket open between answers, so only the first one pays for the handshake
+        uri = f"wss://api.elevenlabs.io/v1/text-to-speech/{VOICE_TYPE}/stream-input?model_id=eleven_turbo_v2_5&output_format=pcm_24000&inactivity_timeout=180"
+        websocket = listen_task = None
+        try:
+            while self.is_running:
+                text_chunk = await self.response_queue_tts.get()
+                if text_chunk is None or not self.is_running:
+                    self.response_queue_tts.task_done(); continue
+
+                self.speaking_started.emit()
+                try:
+                    if websocket is None or websocket.close_code is not None: # First answer, or the server closed it
+                        websocket, listen_task = await self._tts_connect(uri)
+                    await websocket.send(json_dumps({"text": text_chunk + " "}))
                     self.response_queue_tts.task_done()
                     while self.is_running:
                         text_chunk = await self.response_queue_tts.get()
                         if text_chunk is None:
-                            await websocket.send(json.dumps({"text": ""}))
+                            # Flush rather than send the empty end-of-stream frame, which would close the socket
+                            await websocket.send(json_dumps({"text": " ", "flush": True}))
                             self.response_queue_tts.task_done(); break
-                        await websocket.send(json.dumps({"text": text_chunk + " "}))
+                        await websocket.send(json_dumps({"text": text_chunk + " "}))
                         self.response_queue_tts.task_done()
-                    await listen_task
-            except Exception as e: 
-                print(f">>> [ERROR] TTS Error: {e}")
-            finally:
-                self.speaking_stopped.emit()
+                except Exception as e:
+                    print(f">>> [ERROR] TTS Error: {e}")
+                    if websocket is not None: await websocket.close()
+                    websocket = None
+                finally:
+                    self.speaking_stopped.emit()
+        finally:
+            if websocket is not None: await websocket.close()
+            if listen_task is not None: listen_task.cancel()
+
+    def _on_speaker_audio(self, in_data, frame_count, time_info, status):
+        """PortAudio callback (audio thread): fills the output buffer from _play_buf, padding with silence."""
+        if not self.is_running: return (bytes(frame_count * 2), pyaudio.paComplete)
+        need, out = frame_count * 2, bytearray()
+        with self._play_lock:
+            buf, offset = self._play_buf, self._play_offset
+            while need and buf:
+                head = buf[0]
+                take = memoryview(head)[offset:offset + need]
+                out += take
+                need -= len(take); offset += len(take)
+                if offset >= len(head): buf.popleft(); offset = 0
+            self._play_offset = offset
+        if need: out += bytes(need)
+        return (bytes(out), pyaudio.paContinue)
 
     async def play_audio(self):
-        stream = await asyncio.to_thread(pya.open, format=pyaudio.paInt16, channels=1, rate=24000, output=True)
+        # Callback mode: PortAudio pulls from _play_buf, so chunks no longer hop to a thread for a blocking write
+        stream = await asyncio.to_thread(pya.open, format=pyaudio.paInt16, channels=1, rate=RECEIVE_SAMPLE_RATE, output=True,
+                                         frames_per_buffer=PLAYBACK_FRAMES, stream_callback=self._on_speaker_audio)
         while self.is_running:
             bytestream = await self.audio_in_queue_player.get()
             if bytestream and self.is_running:
-                await asyncio.to_thread(stream.write, bytestream)
+                with self._play_lock:
+                    if len(self._play_buf) == self._play_buf.maxlen: self._play_offset = 0 # The append evicts the partly played head
+                    self._play_buf.append(bytestream)
             self.audio_in_queue_player.task_done()
 
     async def main_task_runner(self, session):
@@ -1028,7 +1910,8 @@ class AI_Core(QObject):
 
     @Slot(str)
     def handle_user_text(self, text):
-        if self.is_running and self.loop.is_running(): asyncio.run_coroutine_threadsafe(self.text_input_queue.put(text), self.loop)
+        # The queue is unbounded, so a plain callback avoids wrapping a coroutine in a Future per message
+        if self.is_running and self.loop.is_running(): self.loop.call_soon_threadsafe(self.text_input_queue.put_nowait, text)
 
     async def shutdown_async_tasks(self):
         if self.text_input_queue: await self.text_input_queue.put(None)
@@ -1043,12 +1926,128 @@ class AI_Core(QObject):
             except Exception as e: print(f">>> [ERROR] Timeout or error during async shutdown: {e}")
         if self.audio_stream and self.audio_stream.is_active():
             self.audio_stream.stop_stream(); self.audio_stream.close()
+        self._encode_pool.shutdown(wait=False, cancel_futures=True)
+        self._search_pool.shutdown(wait=False, cancel_futures=True)
 
 # ==============================================================================
 # STYLED GUI APPLICATION
 # ==============================================================================
+# Window-wide stylesheet, kept at module level and applied once in MainWindow.__init__
+_APP_STYLE = """
+QMainWindow { 
+    background-color: #0a0a1a; 
+    font-family: 'Segoe UI', 'Helvetica Neue', sans-serif;
+}
+QWidget#left_panel, QWidget#middle_panel, QWidget#right_panel { 
+    background-color: #10182a; 
+    border: 1px solid #00a1c1;
+    border-radius: 0;
+}
+QLabel#tool_activity_title { 
+    color: #00d1ff; 
+    font-weight: bold; 
+    font-size: 11pt; 
+    padding: 5px;
+    background-color: #1a2035;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+QTextEdit#text_display { 
+    background-color: transparent; 
+    color: #e0e0ff; 
+    font-size: 12pt; 
+    border: none; 
+    padding: 10px; 
+}
+QLineEdit#input_box { 
+    background-color: #0a0a1a; 
+    color: #e0e0ff; 
+    font-size: 11pt; 
+    border: 1px solid #00a1c1; 
+    border-radius: 0px; 
+    padding: 10px; 
+}
+QLineEdit#input_box:focus { border: 1px solid #00ffff; }
+#video_label { 
+    background-color: #000000; 
+    border: 1px solid #00a1c1;
+    border-radius: 0px; 
+}
+QTextBrowser#tool_activity_display { 
+    background-color: #0a0a1a; 
+    color: #a0a0ff; 
+    font-family: 'Consolas', 'Monaco', monospace;
+    font-size: 10pt; 
+    border: none;
+    border-top: 1px solid #00a1c1;
+    padding: 8px; 
+}
+QScrollBar:vertical { 
+    border: none; 
+    background: #10182a; 
+    width: 10px; margin: 0px; 
+}
+QScrollBar::handle:vertical { 
+    background: #00a1c1; 
+    min-height: 20px; 
+    border-radius: 0px; 
+}
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; }
+QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical { background: none; }
+QPushButton { 
+    background-color: transparent; 
+    color: #00d1ff; 
+    border: 1px solid #00d1ff; 
+    padding: 10px; 
+    border-radius: 0px; 
+    font-size: 10pt; 
+    font-weight: bold;
+}
+QPushButton:hover { background-color: #00d1ff; color: #0a0a1a; }
+QPushButton:pressed { background-color: #00ffff; color: #0a0a1a; border: 1px solid #00ffff;}
+"""
+
+# Set on the selected video mode button alone, so switching modes only restyles the two buttons involved
+_ACTIVE_BUTTON_STYLE = "QPushButton { background-color: #00ffff; color: #0a0a1a; border: 1px solid #00ffff; }"
+
+@contextmanager
+def _batched_updates(*widgets):
+    """Suspends painting on widgets for a run of edits, then repaints each once."""
+    for widget in widgets: widget.setUpdatesEnabled(False)
+    try: yield
+    finally:
+        for widget in widgets:
+            widget.setUpdatesEnabled(True)
+            widget.update()
+
+# Path HTML is cached because tools list the same directories and hit the same files over and over
+@functools.lru_cache(maxsize=256)
+def _breadcrumb_html(path):
+    """Renders a directory path as escaped segments joined by arrows."""
+    parts = [part for part in path.replace("\\", "/").split("/") if part]
+    return " &#9658; ".join(f'<span style="color:#87CEEB;">{escape(part)}</span>' for part in parts)
+
+@functools.lru_cache(maxsize=256)
+def _split_path_html(path):
+    """Returns the escaped parent folder and file name of a search match."""
+    parent, _, filename = path.replace("\\", "/").rpartition("/")
+    return escape(parent), escape(filename)
+
 class MainWindow(QMainWindow):
     user_text_submitted = Signal(str)
+    # AI_Core signal name -> MainWindow slot name, connected in _wire_signals
+    _CORE_SIGNALS = (
+        ("text_received", "update_text"),
+        ("search_results_received", "update_search_results"),
+        ("code_being_executed", "display_executed_code"),
+        ("file_list_received", "update_file_list"),
+        ("file_search_received", "update_file_search"),
+        ("file_opened_received", "update_file_opened"),
+        ("tool_activity_received", "update_tool_activity"),
+        ("tool_activity_batch_received", "update_tool_activity_batch"),
+        ("end_of_turn", "add_newline"),
+        ("video_mode_changed", "update_video_mode_ui"),
+    )
 
     def __init__(self):
         super().__init__()
@@ -1056,84 +2055,7 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1600, 900)
         self.setMinimumSize(1280, 720)
         
-        self.setStyleSheet("""
-            QMainWindow { 
-                background-color: #0a0a1a; 
-                font-family: 'Segoe UI', 'Helvetica Neue', sans-serif;
-            }
-            QWidget#left_panel, QWidget#middle_panel, QWidget#right_panel { 
-                background-color: #10182a; 
-                border: 1px solid #00a1c1;
-                border-radius: 0;
-            }
-            QLabel#tool_activity_title { 
-                color: #00d1ff; 
-                font-weight: bold; 
-                font-size: 11pt; 
-                padding: 5px;
-                background-color: #1a2035;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }
-            QTextEdit#text_display { 
-                background-color: transparent; 
-                color: #e0e0ff; 
-                font-size: 12pt; 
-                border: none; 
-                padding: 10px; 
-            }
-            QLineEdit#input_box { 
-                background-color: #0a0a1a; 
-                color: #e0e0ff; 
-                font-size: 11pt; 
-                border: 1px solid #00a1c1; 
-                border-radius: 0px; 
-                padding: 10px; 
-            }
-            QLineEdit#input_box:focus { border: 1px solid #00ffff; }
-            QLabel#video_label { 
-                background-color: #000000; 
-                border: 1px solid #00a1c1;
-                border-radius: 0px; 
-            }
-            QTextBrowser#tool_activity_display { 
-                background-color: #0a0a1a; 
-                color: #a0a0ff; 
-                font-family: 'Consolas', 'Monaco', monospace;
-                font-size: 10pt; 
-                border: none;
-                border-top: 1px solid #00a1c1;
-                padding: 8px; 
-            }
-            QScrollBar:vertical { 
-                border: none; 
-                background: #10182a; 
-                width: 10px; margin: 0px; 
-            }
-            QScrollBar::handle:vertical { 
-                background: #00a1c1; 
-                min-height: 20px; 
-                border-radius: 0px; 
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; }
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical { background: none; }
-            QPushButton { 
-                background-color: transparent; 
-                color: #00d1ff; 
-                border: 1px solid #00d1ff; 
-                padding: 10px; 
-                border-radius: 0px; 
-                font-size: 10pt; 
-                font-weight: bold;
-            }
-            QPushButton:hover { background-color: #00d1ff; color: #0a0a1a; }
-            QPushButton:pressed { background-color: #00ffff; color: #0a0a1a; border: 1px solid #00ffff;}
-            QPushButton#video_button_active { 
-                background-color: #00ffff; 
-                color: #0a0a1a; 
-                border: 1px solid #00ffff;
-            }
-        """)
+        self.setStyleSheet(_APP_STYLE)
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -1149,18 +2071,28 @@ class MainWindow(QMainWindow):
         self.tool_activity_display = QTextBrowser(); self.tool_activity_display.setObjectName("tool_activity_display")
         self.tool_activity_display.setReadOnly(True)
         self.tool_activity_display.setOpenExternalLinks(True)
+        # Read-only logs: no undo history, and Qt drops the oldest blocks itself once the cap is reached
+        self.tool_activity_display.document().setUndoRedoEnabled(False)
+        self.tool_activity_display.document().setMaximumBlockCount(ACTIVITY_LOG_MAX_BLOCKS)
         self.left_layout.addWidget(self.tool_activity_display, 1)
         self.middle_panel = QWidget(); self.middle_panel.setObjectName("middle_panel")
         self.middle_layout = QVBoxLayout(self.middle_panel)
         self.middle_layout.setContentsMargins(0, 0, 0, 15); self.middle_layout.setSpacing(0)
 
         # --- ADDED: Animation Widget ---
-        self.animation_widget = AIAnimationWidget()
+        if RENDER_BACKEND == "opengl" and VideoGLWindow.is_supported():
+            self.animation_widget = AIAnimationGLWidget()
+            # Queued: the swap deletes the GL widget, which must not happen inside its own initializeGL
+            self.animation_widget.gl_unavailable.connect(self._use_cpu_animation, Qt.QueuedConnection)
+        else:
+            self.animation_widget = AIAnimationWidget()
         self.animation_widget.setMinimumHeight(150)
         self.animation_widget.setMaximumHeight(200)
         self.middle_layout.addWidget(self.animation_widget, 2) # Add with a stretch factor
 
         self.text_display = QTextEdit(); self.text_display.setObjectName("text_display"); self.text_display.setReadOnly(True)
+        self.text_display.document().setUndoRedoEnabled(False)
+        self.text_display.document().setMaximumBlockCount(TRANSCRIPT_MAX_BLOCKS)
         self.middle_layout.addWidget(self.text_display, 5) # Add with a stretch factor
         
         input_container = QWidget()
@@ -1181,8 +2113,19 @@ class MainWindow(QMainWindow):
         video_container_layout = QVBoxLayout(self.video_container)
         video_container_layout.setContentsMargins(0,0,0,0)
         
-        self.video_label = QLabel(); self.video_label.setObjectName("video_label")
-        self.video_label.setAlignment(Qt.AlignCenter)
+        if VIDEO_RENDER_BACKEND == "opengl" and VideoGLWindow.is_supported():
+            # Native GL surface in a container, so frames don't go through the widget compositor. The styled
+            # frame around it draws the border the native window would otherwise cover
+            self._video_gl = VideoGLWindow()
+            self.video_label = QFrame(); self.video_label.setObjectName("video_label")
+            frame_layout = QVBoxLayout(self.video_label)
+            frame_layout.setContentsMargins(1, 1, 1, 1) # The 1px border from the #video_label rule
+            self._video_gl_container = QWidget.createWindowContainer(self._video_gl, self.video_label)
+            frame_layout.addWidget(self._video_gl_container)
+            self._video_gl_misses = 0 # Frames seen before the embed was confirmed, see _check_video_gl
+        else:
+            self._video_gl = self._video_gl_container = self._video_gl_misses = None
+            self.video_label = VideoFrameLabel(); self.video_label.setObjectName("video_label")
         self.video_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
 
         video_container_layout.addWidget(self.video_label)
@@ -1201,43 +2144,62 @@ class MainWindow(QMainWindow):
         self.main_layout.addWidget(self.middle_panel, 5)
         self.main_layout.addWidget(self.right_panel, 3)
         self.is_first_ada_chunk = True
+        self._text_buf = [] # Streamed reply text waiting for the next transcript flush
+        self._text_flush_timer = QTimer(self); self._text_flush_timer.setSingleShot(True)
+        self._text_flush_timer.timeout.connect(self._flush_text)
+        self._frame_pump = QTimer(self); self._frame_pump.setInterval(1000 // PREVIEW_FPS)
+        self._frame_pump.timeout.connect(self._paint_pending)
+        self._active_button = None # Video mode button currently carrying _ACTIVE_BUTTON_STYLE
         self.current_video_mode = DEFAULT_MODE
-        self.setup_backend_thread()
+        self.ai_core = None # Built on the first event loop pass, see setup_backend_thread
+        QTimer.singleShot(0, self.setup_backend_thread)
 
     def setup_backend_thread(self):
+        # Runs in three queued steps so the window paints before the backend is built
+        self._construct_core()
+        QTimer.singleShot(0, self._wire_signals)
+
+    def _construct_core(self):
         parser = argparse.ArgumentParser()
         parser.add_argument("--mode", type=str, default=DEFAULT_MODE, help="pixels to stream from", choices=["camera", "screen", "none"])
         args, unknown = parser.parse_known_args()
         
         self.ai_core = AI_Core(video_mode=args.mode)
-        
-        self.user_text_submitted.connect(self.ai_core.handle_user_text)
-        self.webcam_button.clicked.connect(lambda: self.ai_core.set_video_mode("camera"))
-        self.screenshare_button.clicked.connect(lambda: self.ai_core.set_video_mode("screen"))
-        self.off_button.clicked.connect(lambda: self.ai_core.set_video_mode("none"))
-        
-        self.ai_core.text_received.connect(self.update_text)
-        self.ai_core.search_results_received.connect(self.update_search_results)
-        self.ai_core.code_being_executed.connect(self.display_executed_code)
-        self.ai_core.file_list_received.connect(self.update_file_list)
-        self.ai_core.file_search_received.connect(self.update_file_search)
-        self.ai_core.file_opened_received.connect(self.update_file_opened)
-        self.ai_core.tool_activity_received.connect(self.update_tool_activity)
-        self.ai_core.end_of_turn.connect(self.add_newline)
-        self.ai_core.frame_received.connect(self.update_frame)
-        self.ai_core.video_mode_changed.connect(self.update_video_mode_ui)
-        self.ai_core.speaking_started.connect(self.animation_widget.start_speaking_animation)
-        self.ai_core.speaking_stopped.connect(self.animation_widget.stop_speaking_animation)
-
-        self.backend_thread = threading.Thread(target=self.ai_core.start_event_loop)
-        self.backend_thread.daemon = True
-        self.backend_thread.start()
-        
         self.update_video_mode_ui(self.ai_core.video_mode)
 
+    def _wire_signals(self):
+        core = self.ai_core
+        for signal, slot in self._CORE_SIGNALS:
+            getattr(core, signal).connect(getattr(self, slot))
+        self.user_text_submitted.connect(core.handle_user_text)
+        self.webcam_button.clicked.connect(functools.partial(core.set_video_mode, "camera"))
+        self.screenshare_button.clicked.connect(functools.partial(core.set_video_mode, "screen"))
+        self.off_button.clicked.connect(functools.partial(core.set_video_mode, "none"))
+        core.speaking_started.connect(self.animation_widget.start_speaking_animation)
+        core.speaking_stopped.connect(self.animation_widget.stop_speaking_animation)
+        QTimer.singleShot(0, self._start_thread)
+
+    def _start_thread(self):
+        self.backend_thread = threading.Thread(target=self.ai_core.start_event_loop, name="ai-core", daemon=True)
+        self.backend_thread.start()
+        self._frame_pump.start() # Polls the core's preview slot, no per-frame cross-thread event
+
+    def _use_cpu_animation(self):
+        """Replaces the GL sphere with the QPainter one after GL setup failed at first show."""
+        old, new = self.animation_widget, AIAnimationWidget()
+        new.setMinimumHeight(old.minimumHeight()); new.setMaximumHeight(old.maximumHeight())
+        if old.is_speaking: new.start_speaking_animation()
+        self.middle_layout.replaceWidget(old, new)
+        old.deleteLater()
+        self.animation_widget = new
+        if self.ai_core is not None: # Already wired to the old widget, whose connections die with it
+            self.ai_core.speaking_started.connect(new.start_speaking_animation)
+            self.ai_core.speaking_stopped.connect(new.stop_speaking_animation)
+
     def send_user_text(self):
         text = self.input_box.text().strip()
         if text:
+            self._flush_text() # Finish drawing the reply it interrupts first
             self.text_display.append(f"<p style='color:#00ffff; font-weight:bold;'>&gt; USER:</p><p style='color:#e0e0ff; padding-left: 10px;'>{escape(text)}</p>")
             self.user_text_submitted.emit(text)
             self.input_box.clear()
@@ -1245,24 +2207,24 @@ class MainWindow(QMainWindow):
     @Slot(str)
     def update_video_mode_ui(self, mode):
         self.current_video_mode = mode
-        self.webcam_button.setObjectName("")
-        self.screenshare_button.setObjectName("")
-        self.off_button.setObjectName("")
-
-        if mode == "camera":
-            self.webcam_button.setObjectName("video_button_active")
-        elif mode == "screen":
-            self.screenshare_button.setObjectName("video_button_active")
-        elif mode == "none":
-            self.off_button.setObjectName("video_button_active")
-            self.video_label.clear()
-
-        for button in [self.webcam_button, self.screenshare_button, self.off_button]:
-            button.style().unpolish(button)
-            button.style().polish(button)
+        if mode == "none": self._clear_video()
+        new = {"camera": self.webcam_button, "screen": self.screenshare_button, "none": self.off_button}.get(mode)
+        if new is self._active_button: return # Same mode again: nothing to restyle
+        # setStyleSheet re-polishes just that button
+        if self._active_button is not None: self._active_button.setStyleSheet("")
+        if new is not None: new.setStyleSheet(_ACTIVE_BUTTON_STYLE)
+        self._active_button = new
 
     @Slot(str)
     def update_text(self, text):
+        self._text_buf.append(text)
+        if not self._text_flush_timer.isActive(): self._text_flush_timer.start(GUI_TEXT_FLUSH_MS)
+
+    def _flush_text(self):
+        """Inserts the buffered reply text in one edit, so a fast stream costs one relayout per flush."""
+        self._text_flush_timer.stop()
+        if not self._text_buf: return
+        text = "".join(self._text_buf); self._text_buf.clear()
         if self.is_first_ada_chunk:
             self.is_first_ada_chunk = False
             self.text_display.append(f"<p style='color:#00d1ff; font-weight:bold;'>&gt; A.L.Y.X.:</p>")
@@ -1273,24 +2235,29 @@ class MainWindow(QMainWindow):
 
     def _append_activity(self, tag, html_body):
         """Appends a timestamped activity block to the system log."""
-        import datetime
-        ts = datetime.datetime.now().strftime("%H:%M:%S")
+        ts = time.strftime("%H:%M:%S")
         header = f'<p style="color:#00d1ff; font-weight:bold; margin:8px 0 2px 0;">[{ts}] {tag}</p>'
-        self.tool_activity_display.append(header + html_body)
-        self.tool_activity_display.verticalScrollBar().setValue(
-            self.tool_activity_display.verticalScrollBar().maximum()
-        )
+        display = self.tool_activity_display
+        sb = display.verticalScrollBar()
+        follow = sb.value() >= sb.maximum() - 4 # Leave the view alone if the user scrolled up to read
+        cursor = QTextCursor(display.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        if not display.document().isEmpty(): cursor.insertBlock()
+        cursor.insertHtml(header + html_body)
+        cursor.endEditBlock()
+        if follow: sb.setValue(sb.maximum())
 
     @Slot(list)
     def update_search_results(self, urls):
         if not urls:
             return
         self.tool_activity_title.setText("SYSTEM ACTIVITY // SEARCH")
-        html_content = ""
+        html = []
         for i, url in enumerate(urls):
             display_text = url.split('//')[1].split('/')[0] if '//' in url else url
-            html_content += f'<p style="margin:0; padding: 2px 0;">{i+1}: <a href="{url}" style="color: #00ffff; text-decoration: none;">{display_text}</a></p>'
-        self._append_activity("&#128269; WEB SEARCH", html_content)
+            html.append(f'<p style="margin:0; padding: 2px 0;">{i+1}: <a href="{url}" style="color: #00ffff; text-decoration: none;">{display_text}</a></p>')
+        self._append_activity("&#128269; WEB SEARCH", "".join(html))
 
     @Slot(str, str)
     def display_executed_code(self, code, result):
@@ -1303,97 +2270,114 @@ class MainWindow(QMainWindow):
         self._append_activity("&#128187; CODE EXECUTION", html)
 
     @Slot(str, list)
-    def update_file_list(self, directory_path, files):
+    def update_file_list(self, directory_path, entries):
         if not directory_path:
             return
         self.tool_activity_title.setText("SYSTEM ACTIVITY // FILESYS")
-        # Build breadcrumb path visualization
-        parts = directory_path.replace("\\", "/").split("/")
-        breadcrumb = ""
-        for i, part in enumerate(parts):
-            if not part:
-                continue
-            sep = " &#9658; " if i > 0 and breadcrumb else ""
-            breadcrumb += f'{sep}<span style="color:#87CEEB;">{escape(part)}</span>'
-        html = f'<p style="margin-bottom:4px;">&#128193; {breadcrumb}</p>'
-        if not files:
-            html += '<p style="color:#a0a0ff; font-style:italic;">(Directory is empty)</p>'
+        html = [f'<p style="margin-bottom:4px;">&#128193; {_breadcrumb_html(directory_path)}</p>']
+        if not entries:
+            html.append('<p style="color:#a0a0ff; font-style:italic;">(Directory is empty)</p>')
         else:
-            folders = sorted([i for i in files if os.path.isdir(os.path.join(directory_path, i))])
-            file_items = sorted([i for i in files if not os.path.isdir(os.path.join(directory_path, i))])
-            html += '<div style="padding-left:8px; border-left: 2px solid #00a1c1; margin-top:4px;">'
-            for folder in folders:
-                html += f'<p style="margin:1px 0; color:#87CEEB;">&#128194; {escape(folder)}/</p>'
-            for file_item in file_items:
-                html += f'<p style="margin:1px 0; color:#e0e0ff;">&#128196; {escape(file_item)}</p>'
-            html += '</div>'
-        self._append_activity("&#128194; FILE SYSTEM", html)
+            folders = sorted(name for name, is_dir in entries if is_dir)
+            file_items = sorted(name for name, is_dir in entries if not is_dir)
+            html.append('<div style="padding-left:8px; border-left: 2px solid #00a1c1; margin-top:4px;">')
+            html.extend(f'<p style="margin:1px 0; color:#87CEEB;">&#128194; {escape(folder)}/</p>' for folder in folders)
+            html.extend(f'<p style="margin:1px 0; color:#e0e0ff;">&#128196; {escape(file_item)}</p>' for file_item in file_items)
+            html.append('</div>')
+        self._append_activity("&#128194; FILE SYSTEM", "".join(html))
 
     @Slot(str, str)
     def update_tool_activity(self, tag, html_body):
         self.tool_activity_title.setText(f"SYSTEM ACTIVITY // {tag.split()[-1]}")
         self._append_activity(tag, html_body)
 
+    @Slot(list)
+    def update_tool_activity_batch(self, entries):
+        self.tool_activity_title.setText(f"SYSTEM ACTIVITY // {entries[-1][0].split()[-1]}")
+        with _batched_updates(self.tool_activity_display):
+            for tag, html_body in entries: self._append_activity(tag, html_body)
+
     @Slot(str, list)
     def update_file_search(self, query, matches):
         self.tool_activity_title.setText("SYSTEM ACTIVITY // FILE SEARCH")
-        html = f'<p style="margin-bottom:4px;">&#128269; Searching for: <span style="color:#00ffff;">{escape(query)}</span></p>'
+        html = [f'<p style="margin-bottom:4px;">&#128269; Searching for: <span style="color:#00ffff;">{escape(query)}</span></p>']
         if not matches:
-            html += '<p style="color:#ff6b6b; font-style:italic;">&#10007; No matches found.</p>'
+            html.append('<p style="color:#ff6b6b; font-style:italic;">&#10007; No matches found.</p>')
         else:
-            html += '<div style="padding-left:8px; border-left: 2px solid #00ffff; margin-top:4px;">'
+            html.append('<div style="padding-left:8px; border-left: 2px solid #00ffff; margin-top:4px;">')
             for i, path in enumerate(matches):
-                # Visualize path segments as a breadcrumb tree
-                parts = path.replace("\\", "/").split("/")
-                indent = ""
-                for j, part in enumerate(parts[:-1]):
-                    indent += "&nbsp;&nbsp;"
-                filename = parts[-1]
-                prefix = "&#128196;" if i == 0 else "&#128196;"
-                color = "#00ffff" if i == 0 else "#c0c0ff"
-                html += f'<p style="margin:1px 0; color:{color};">{prefix} <span style="color:#888;">{escape("/".join(parts[:-1]))}/</span><strong>{escape(filename)}</strong></p>'
-            html += '</div>'
+                color = "#00ffff" if i == 0 else "#c0c0ff" # Best match highlighted
+                parent_html, filename_html = _split_path_html(path)
+                html.append(f'<p style="margin:1px 0; color:{color};">&#128196; <span style="color:#888;">{parent_html}/</span><strong>{filename_html}</strong></p>')
+            html.append('</div>')
             if len(matches) == 1:
-                html += f'<p style="color:#90EE90; margin-top:4px;">&#10003; 1 match found.</p>'
+                html.append('<p style="color:#90EE90; margin-top:4px;">&#10003; 1 match found.</p>')
             else:
-                html += f'<p style="color:#90EE90; margin-top:4px;">&#10003; {len(matches)} matches found.</p>'
-        self._append_activity("&#128270; FILE SEARCH", html)
+                html.append(f'<p style="color:#90EE90; margin-top:4px;">&#10003; {len(matches)} matches found.</p>')
+        self._append_activity("&#128270; FILE SEARCH", "".join(html))
 
     @Slot(str)
     def update_file_opened(self, file_path):
         self.tool_activity_title.setText("SYSTEM ACTIVITY // FILE OPEN")
-        parts = file_path.replace("\\", "/").split("/")
-        filename = parts[-1]
-        dir_path = "/".join(parts[:-1])
+        dir_html, filename_html = _split_path_html(file_path)
         html = (
-            f'<p style="margin:2px 0;">&#128194; <span style="color:#888;">{escape(dir_path)}/</span></p>'
+            f'<p style="margin:2px 0;">&#128194; <span style="color:#888;">{dir_html}/</span></p>'
             f'<p style="margin:2px 0; padding-left:12px; border-left:2px solid #00ffff;">'
-            f'&#128196; <span style="color:#00ffff; font-weight:bold;">{escape(filename)}</span>'
+            f'&#128196; <span style="color:#00ffff; font-weight:bold;">{filename_html}</span>'
             f' <span style="color:#90EE90;">&#9654; OPENED</span></p>'
         )
         self._append_activity("&#128196; FILE OPENED", html)
 
     @Slot()
     def add_newline(self):
+        self._flush_text()
         if not self.is_first_ada_chunk: self.text_display.append("")
         self.is_first_ada_chunk = True
 
-    @Slot(QImage)
+    def _paint_pending(self):
+        image = self.ai_core.take_frame()
+        if image is None: return
+        self.update_frame(image)
+        self.ai_core.frame_consumed() # After painting, so the backend won't refill the buffer still on screen
+
     def update_frame(self, image):
         if self.current_video_mode == "none":
-            if self.video_label.pixmap():
-                self.video_label.clear()
+            self._clear_video()
             return
 
-        if not image.isNull():
-            pixmap = QPixmap.fromImage(image)
-            scaled_pixmap = pixmap.scaled(self.video_container.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.video_label.setPixmap(scaled_pixmap)
-        else:
-            self.video_label.clear()
+        if image.isNull():
+            self._clear_video(); return
+        if self._video_gl is not None and self._video_gl_misses is not None: self._check_video_gl()
+        if self._video_gl is not None:
+            self._video_gl.push_frame(image); return # Scaled on the GPU
+        self.video_label.set_frame(image)
+
+    def _check_video_gl(self):
+        """Confirms once that the native GL window is mapped and sized with its container, else falls back."""
+        if not self.isVisible() or self.isMinimized(): return # Can't tell yet
+        gl = self._video_gl
+        if gl.isExposed() and gl.size() == self._video_gl_container.size():
+            self._video_gl_misses = None # Embedded fine; stop checking
+            return
+        self._video_gl_misses += 1 # Exposure can lag the first frames, so allow about a second of them
+        if self._video_gl_misses >= PREVIEW_FPS: self._use_cpu_video()
+
+    def _use_cpu_video(self):
+        """Swaps the GL preview for VideoFrameLabel when the native child window didn't embed properly."""
+        print(">>> [WARN] GL video window is not tracking its container; using the software preview.")
+        old = self.video_label
+        self.video_label = VideoFrameLabel(); self.video_label.setObjectName("video_label")
+        self.video_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self.video_container.layout().replaceWidget(old, self.video_label)
+        old.deleteLater() # Takes the container and the GL window with it
+        self._video_gl = self._video_gl_container = self._video_gl_misses = None
             
+    def _clear_video(self):
+        if self._video_gl is not None: self._video_gl.push_frame(QImage())
+        elif self.video_label.has_frame(): self.video_label.set_frame(QImage())
+
     def closeEvent(self, event):
-        self.ai_core.stop()
+        if self.ai_core is not None: self.ai_core.stop()
         event.accept()
 
 # ==============================================================================